@@ -0,0 +1,2 @@
+from _bench.scripts import GEN_DIRECTORY, load_script, TX_DIRECTORY
+from _bench.synth import synthesize_specs
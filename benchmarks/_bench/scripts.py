@@ -0,0 +1,34 @@
+from importlib.util import module_from_spec, spec_from_file_location
+from os import path as pathfx
+from sys import path as syspath
+from types import ModuleType
+
+ROOT_DIRECTORY = pathfx.abspath(
+    pathfx.join(pathfx.dirname(pathfx.abspath(__file__)), "..", "..")
+)
+GEN_DIRECTORY = pathfx.join(ROOT_DIRECTORY, "downlink-generation")
+TX_DIRECTORY = pathfx.join(
+    ROOT_DIRECTORY,
+    "downlink-transmission",
+    "local-server",
+    "UG6x-Milesight-Gateway",
+)
+
+
+def load_script(filepath: str, name: str) -> ModuleType:
+    """Import a (hyphenated) script as module without running its main.
+
+    Args:
+        filepath (str): Absolute filepath to python script.
+        name (str): Module name.
+
+    Returns:
+        ModuleType: Imported module, globals of the main block are unset.
+    """
+    directory = pathfx.dirname(filepath)
+    if directory not in syspath:  # underscore packages next to the script
+        syspath.insert(0, directory)
+    spec = spec_from_file_location(name, filepath)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
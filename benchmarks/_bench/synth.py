@@ -0,0 +1,52 @@
+from os import path as pathfx
+from random import Random
+from typing import Any, Dict, List
+
+from pandas import DataFrame, read_excel
+
+from _bench.scripts import GEN_DIRECTORY
+
+
+def synthesize_specs(rows: int, seed: int = 0, servers: int = 16) -> DataFrame:
+    """Synthesize device specifications from the Conf-Table combinations.
+
+    Args:
+        rows (int): Number of devices.
+        seed (int, optional): Random seed. Defaults to 0.
+        servers (int, optional): Number of gateways. Defaults to 16.
+
+    Returns:
+        DataFrame: Device specifications with input template headers.
+    """
+    rng = Random(seed)
+    table = read_excel(
+        pathfx.join(GEN_DIRECTORY, "conf-table.xlsx"),
+        sheet_name="Conf-Table",
+        skiprows=1,
+        index_col="index",
+        engine="openpyxl",
+    )
+    table = table[
+        table["steam-trap-type"].isin(["bimetallic", "membrane", "ball-float"])
+    ]
+    combinations = table.to_dict(orient="records")
+    addresses = [f"192.168.{i}.1" for i in range(1, servers + 1)]
+    specs: List[Dict[str, Any]] = []
+    for i in range(rows):
+        params = rng.choice(combinations)
+        specs.append(
+            {
+                "DevEUI": f"A840{i:012X}",
+                "Server": rng.choice(addresses),
+                "Steam Trap Type": params["steam-trap-type"],
+                "DN": rng.choice([15, 20, 25, 40, 50, 65]),
+                "Mounting Type": params["mounting-type"],
+                "Differential Pressure [barg]": rng.uniform(
+                    params["p-min [barg]"], params["p-max [barg]"]
+                ),
+                "Hardware Model": params["hardware-model"],
+                "Application": "Steam line",
+                "Condensate Load": params["condensate-load"],
+            }
+        )
+    return DataFrame(specs)
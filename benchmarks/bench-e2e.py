@@ -0,0 +1,447 @@
+from argparse import ArgumentParser
+from datetime import datetime
+from json import dump as json_dump, load as json_load
+from logging import getLogger, WARNING
+from os import cpu_count, makedirs, path as pathfx
+from platform import platform, python_version
+from subprocess import DEVNULL, Popen, run
+from sys import executable
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+from typing import Any, Dict, List
+
+from httpx import get as http_get
+from pandas import concat
+from yaml import (
+    dump as yaml_dump,
+    SafeLoader as YAMLSafeLoader,
+    load as yaml_load,
+)
+
+from _bench import GEN_DIRECTORY, load_script, synthesize_specs, TX_DIRECTORY
+
+"""
+This file benchmarks generation (gen-downlinks.py) and transmission
+(msb-ug6x-conf.py against local mock gateways) end-to-end on synthesized
+device specification workbooks of configurable sizes.
+
+The generation stages (look-up tables import, index build, specs import,
+matching, building, streamed grouping and json completion) are timed in-process, the
+whole scripts are timed as subprocesses. Results are stored as json, pass
+a previous results file with --compare to print the relative changes.
+
+    python bench-e2e.py --rows 1000 10000 100000 --compare results/old.json
+"""
+
+BENCH_DIRECTORY = pathfx.dirname(pathfx.abspath(__file__))
+MOCK_PORT = 18443  # first mock gateway port
+
+
+def generator_config(tmp: str, filepath: str) -> Dict[str, Any]:
+    """Write benchmark configuration of the generator.
+
+    Args:
+        tmp (str): Temporary directory.
+        filepath (str): Filepath to input workbook.
+
+    Returns:
+        Dict[str, Any]: Configuration (saved as <tmp>/gen-config.yaml).
+    """
+    with open(pathfx.join(GEN_DIRECTORY, "config.example.yaml")) as file:
+        config = yaml_load(stream=file, Loader=YAMLSafeLoader)
+    config["input"]["filepath"] = filepath
+    config["input"]["format"] = "xlsx"
+    config["input"]["skiprows"] = 0  # synthesized workbook has no preamble
+    config["lookup"]["workbook"] = pathfx.join(
+        GEN_DIRECTORY, "conf-table.xlsx"
+    )
+    config["lookup"]["cache"] = None  # time the real xlsx import
+    config["logging"]["fileHandler"]["logsDirectory"] = tmp
+    config["logging"]["fileHandler"]["logLevel"] = "WARNING"
+    config["logging"]["streamHandler"]["console"] = "stderr"
+    config["logging"]["streamHandler"]["logLevel"] = "ERROR"
+    config["output"]["filepath"] = pathfx.join(tmp, "downlinks.json")
+    config["output"]["indent"] = None
+    config["metrics"] = None
+    with open(pathfx.join(tmp, "gen-config.yaml"), mode="w") as file:
+        yaml_dump(config, file)
+    return config
+
+
+def transmitter_config(
+    tmp: str, filepath: str, asynchronous: bool
+) -> Dict[str, Any]:
+    """Write benchmark configuration of the transmitter.
+
+    Args:
+        tmp (str): Temporary directory.
+        filepath (str): Filepath to input file (generated downlinks).
+        asynchronous (bool): Use the asynchronous transmission engine.
+
+    Returns:
+        Dict[str, Any]: Configuration (saved as <tmp>/tx-config.yaml).
+    """
+    with open(pathfx.join(TX_DIRECTORY, "config.example.yaml")) as file:
+        config = yaml_load(stream=file, Loader=YAMLSafeLoader)
+    config["input"]["filepath"] = filepath
+    config["journal"] = None
+    config["metrics"] = {"filepath": pathfx.join(tmp, "tx-metrics.json")}
+    config["logging"]["fileHandler"]["logsDirectory"] = tmp
+    config["logging"]["fileHandler"]["logLevel"] = "WARNING"
+    config["logging"]["streamHandler"]["console"] = "stderr"
+    config["logging"]["streamHandler"]["logLevel"] = "ERROR"
+    config["client"]["async"] = asynchronous
+    config["client"]["insecure"] = True
+    config["client"]["tokenCache"] = None
+    with open(pathfx.join(tmp, "tx-config.yaml"), mode="w") as file:
+        yaml_dump(config, file)
+    return config
+
+
+def bench_generation(
+    gen: Any, config: Dict[str, Any], filepath: str
+) -> Dict[str, Any]:
+    """Time the stages of the downlink generation (single process).
+
+    Args:
+        gen (Any): Imported gen-downlinks.py module.
+        config (Dict[str, Any]): Generator configuration.
+        filepath (str): Filepath to input workbook.
+
+    Returns:
+        Dict[str, Any]: Seconds per stage and generated downlinks.
+    """
+    match_params = [
+        "steam-trap-type",
+        "mounting-type",
+        "hardware-model",
+        "condensate-load",
+    ]
+    gen.config = config
+    gen.log = getLogger("bench-e2e")
+    gen.log.setLevel(WARNING)
+    seconds: Dict[str, float] = {}
+
+    start = perf_counter()
+    msb_config_params, pt_table = gen.import_xlsx_tables(
+        filepath=config["lookup"]["workbook"],
+        sheet1=config["lookup"]["sheet1"],
+        sheet2=config["lookup"]["sheet2"],
+    )
+    seconds["tables"] = perf_counter() - start
+
+    start = perf_counter()
+    gen.init_worker(config, msb_config_params, pt_table, match_params, None)
+    seconds["index"] = perf_counter() - start
+
+    start = perf_counter()
+    df = concat(list(gen.import_specs(filepath, fmt="xlsx")))
+    seconds["import"] = perf_counter() - start
+
+    start = perf_counter()
+    matches = gen.match_specs(df)
+    seconds["matching"] = perf_counter() - start
+
+    start = perf_counter()
+    built = gen.build_matches(matches)
+    seconds["build"] = perf_counter() - start
+
+    start = perf_counter()
+    writer = gen.open_downlinks_writer(config["output"]["filepath"])
+    devices = [(row.server, row.deveui) for row, _ in matches]
+    gen.group_by_server(writer, devices, built, {})
+    seconds["grouping"] = perf_counter() - start
+
+    start = perf_counter()
+    writer.close()
+    seconds["dump"] = perf_counter() - start
+
+    seconds["stages"] = sum(seconds.values())
+    with open(config["output"]["filepath"]) as file:
+        dct = json_load(fp=file)
+    return {"seconds": seconds, "devices": len(devices), "dct": dct}
+
+
+def start_mocks(n: int, args: Any) -> List[Popen]:
+    """Start local mock gateways (ports MOCK_PORT, MOCK_PORT + 1, ...).
+
+    Args:
+        n (int): Number of mock gateways.
+        args (Any): Parsed command line arguments (mock settings).
+
+    Raises:
+        TimeoutError: Raised if a mock gateway doesn't come up.
+
+    Returns:
+        List[Popen]: Mock gateway processes.
+    """
+    mocks = [
+        Popen(
+            [
+                executable,
+                "mock-ug6x-gateway.py",
+                "--port",
+                str(MOCK_PORT + i),
+                "--latency",
+                str(args.latency),
+                "--error-rate",
+                str(args.error_rate),
+                "--seed",
+                str(i),
+            ],
+            cwd=TX_DIRECTORY,
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+        )
+        for i in range(n)
+    ]
+    for i in range(n):
+        for _ in range(100):
+            try:
+                http_get(
+                    f"https://127.0.0.1:{MOCK_PORT + i}/mock/stats",
+                    verify=False,
+                )
+                break
+            except Exception:
+                sleep(0.1)
+        else:
+            raise TimeoutError(f"Mock gateway {MOCK_PORT + i} didn't start.")
+    return mocks
+
+
+def transmission_input(
+    dct: Dict[str, Any], gateways: int, devices: int
+) -> Dict[str, Any]:
+    """Re-address the generated server blocks to the mock gateways.
+
+    Args:
+        dct (Dict[str, Any]): Generated downlinks.
+        gateways (int): Number of mock gateways.
+        devices (int): Max. number of devices to transmit.
+
+    Returns:
+        Dict[str, Any]: Input file of the transmitter.
+    """
+    blocks: List[Dict[str, Any]] = []
+    for i, server in enumerate(dct["server"]):
+        if devices <= 0:
+            break
+        downlinks = dict(list(server["downlinks"].items())[:devices])
+        devices -= len(downlinks)
+        blocks.append(
+            {
+                **server,
+                "address": {
+                    "protocol": "https",
+                    "host": "127.0.0.1",
+                    "port": MOCK_PORT + i % gateways,
+                },
+                "credentials": {"username": "apiuser", "password": "password"},
+                "downlinks": downlinks,
+            }
+        )
+    return {"server": blocks}
+
+
+def bench_transmission(
+    tmp: str, dct: Dict[str, Any], args: Any, asynchronous: bool
+) -> Dict[str, Any]:
+    """Time the transmitter against fresh mock gateways.
+
+    Args:
+        tmp (str): Temporary directory.
+        dct (Dict[str, Any]): Generated downlinks.
+        args (Any): Parsed command line arguments.
+        asynchronous (bool): Use the asynchronous transmission engine.
+
+    Returns:
+        Dict[str, Any]: Wall-clock seconds, throughput and mock stats.
+    """
+    tx_input = transmission_input(dct, args.gateways, args.transmit_devices)
+    n_downlinks = sum(
+        len(downlinks)
+        for server in tx_input["server"]
+        for downlinks in server["downlinks"].values()
+    )
+    with open(pathfx.join(tmp, "tx-input.json"), mode="w") as file:
+        json_dump(obj=tx_input, fp=file)
+    transmitter_config(tmp, pathfx.join(tmp, "tx-input.json"), asynchronous)
+    mocks = start_mocks(args.gateways, args)
+    try:
+        start = perf_counter()
+        run(
+            [
+                executable,
+                "msb-ug6x-conf.py",
+                "--config",
+                pathfx.join(tmp, "tx-config.yaml"),
+            ],
+            cwd=TX_DIRECTORY,
+            check=True,
+        )
+        seconds = perf_counter() - start
+        stats = [
+            http_get(
+                f"https://127.0.0.1:{MOCK_PORT + i}/mock/stats", verify=False
+            ).json()["stats"]
+            for i in range(args.gateways)
+        ]
+    finally:
+        for mock in mocks:
+            mock.terminate()
+            mock.wait()
+    queued = sum(stat["queued"] for stat in stats)
+    with open(pathfx.join(tmp, "tx-metrics.json")) as file:
+        timers = json_load(fp=file)["timers"]
+    return {
+        "seconds": seconds,
+        "downlinks": n_downlinks,
+        "queued": queued,
+        "requests": sum(stat["requests"] for stat in stats),
+        "downlinksPerSecond": queued / seconds,
+        "meanSeconds": {name: timer["mean"] for name, timer in timers.items()},
+    }
+
+
+def bench(args: Any) -> Dict[str, Any]:
+    """Run all benchmarks for each number of rows.
+
+    Args:
+        args (Any): Parsed command line arguments.
+
+    Returns:
+        Dict[str, Any]: Results by number of rows.
+    """
+    gen = load_script(pathfx.join(GEN_DIRECTORY, "gen-downlinks.py"), "gen")
+    results: Dict[str, Any] = {}
+    for rows in args.rows:
+        with TemporaryDirectory() as tmp:
+            filepath = pathfx.join(tmp, "input.xlsx")
+            synthesize_specs(rows, args.seed, args.gateways).to_excel(
+                filepath, index=False
+            )
+            config = generator_config(tmp, filepath)
+            generation = bench_generation(gen, config, filepath)
+            dct = generation.pop("dct")
+
+            start = perf_counter()
+            run(
+                [
+                    executable,
+                    "gen-downlinks.py",
+                    "--config",
+                    pathfx.join(tmp, "gen-config.yaml"),
+                ],
+                cwd=GEN_DIRECTORY,
+                check=True,
+            )
+            generation["seconds"]["script"] = perf_counter() - start
+
+            results[str(rows)] = {"generation": generation}
+            for mode in args.modes:
+                results[str(rows)][
+                    f"transmission-{mode}"
+                ] = bench_transmission(tmp, dct, args, mode == "async")
+    return results
+
+
+def flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten the timings of a results file for comparison.
+
+    Args:
+        results (Dict[str, Any]): Results by number of rows.
+
+    Returns:
+        Dict[str, float]: Seconds by "<rows>/<benchmark>/<stage>".
+    """
+    flat: Dict[str, float] = {}
+    for rows, benchmarks in results.items():
+        for name, result in benchmarks.items():
+            if isinstance(result["seconds"], dict):
+                for stage, seconds in result["seconds"].items():
+                    flat[f"{rows}/{name}/{stage}"] = seconds
+            else:
+                flat[f"{rows}/{name}"] = result["seconds"]
+    return flat
+
+
+def git_revision() -> str | None:
+    """Get the benchmarked revision (commit, -dirty if modified) or None."""
+    try:
+        return run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=BENCH_DIRECTORY,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark generation/transmission.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gateways", type=int, default=2)
+    parser.add_argument(
+        "--transmit-devices",
+        type=int,
+        default=200,
+        help="max. devices transmitted per run",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="*",
+        choices=["sync", "async"],
+        default=["sync", "async"],
+        help="transmission engines to benchmark (none to skip)",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="mock gateway latency"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="mock 503 share"
+    )
+    parser.add_argument("--output", default=None, help="results json file")
+    parser.add_argument("--compare", default=None, help="previous results")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": python_version(),
+            "platform": platform(),
+            "cpus": cpu_count(),
+            "args": vars(args),
+        },
+        "results": bench(args),
+    }
+
+    output = args.output or pathfx.join(
+        BENCH_DIRECTORY,
+        "results",
+        f"e2e-{datetime.now().strftime('%Y-%m-%d--%H-%M-%S')}.json",
+    )
+    if pathfx.dirname(output):
+        makedirs(pathfx.dirname(output), exist_ok=True)
+    with open(output, mode="w") as file:
+        json_dump(obj=results, fp=file, indent=2)
+
+    current = flatten(results["results"])
+    previous: Dict[str, float] = {}
+    if args.compare:
+        with open(args.compare) as file:
+            previous = flatten(json_load(fp=file)["results"])
+    print(f"{'benchmark':<40} {'seconds':>9} {'previous':>9} {'change':>8}")
+    for name, seconds in current.items():
+        if name in previous:
+            change = f"{(seconds / previous[name] - 1) * 100:>+7.1f}%"
+            print(
+                f"{name:<40} {seconds:>9.3f} {previous[name]:>9.3f} {change}"
+            )
+        else:
+            print(f"{name:<40} {seconds:>9.3f} {'-':>9} {'-':>8}")
+    print(f"results: {output}")
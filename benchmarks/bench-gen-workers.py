@@ -0,0 +1,78 @@
+from argparse import ArgumentParser
+from os import cpu_count, path as pathfx
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict
+
+from yaml import (
+    dump as yaml_dump,
+    SafeLoader as YAMLSafeLoader,
+    load as yaml_load,
+)
+
+from _bench import GEN_DIRECTORY, synthesize_specs
+
+"""
+This file benchmarks the multi-process downlink generation
+(gen-downlinks.py --workers N) on synthesized device specifications and
+prints the wall-clock time and speed-up for each number of workers.
+"""
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark generation workers.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunksize", type=int, default=None)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        # synthesize input and benchmark configuration
+        synthesize_specs(args.rows).to_csv(
+            pathfx.join(tmp, "input.csv"), index=False
+        )
+        with open(pathfx.join(GEN_DIRECTORY, "config.example.yaml")) as file:
+            config = yaml_load(stream=file, Loader=YAMLSafeLoader)
+        config["input"]["filepath"] = pathfx.join(tmp, "input.csv")
+        config["input"]["format"] = "csv"
+        config["input"]["chunksize"] = args.chunksize
+        config["lookup"]["cache"] = pathfx.join(tmp, "conf-table.pickle")
+        config["logging"]["fileHandler"]["logsDirectory"] = tmp
+        config["logging"]["fileHandler"]["logLevel"] = "WARNING"
+        config["logging"]["streamHandler"]["console"] = "stderr"
+        config["logging"]["streamHandler"]["logLevel"] = "ERROR"
+        config["output"]["filepath"] = pathfx.join(tmp, "downlinks.json")
+        with open(pathfx.join(tmp, "config.yaml"), mode="w") as file:
+            yaml_dump(config, file)
+
+        # run generation once per number of workers (first run warms cache)
+        results: Dict[int, float] = {}
+        outputs: Dict[int, bytes] = {}
+        for workers in [args.workers[0]] + args.workers:
+            start = perf_counter()
+            run(
+                [
+                    executable,
+                    "gen-downlinks.py",
+                    "--config",
+                    pathfx.join(tmp, "config.yaml"),
+                    "--workers",
+                    str(workers),
+                ],
+                cwd=GEN_DIRECTORY,
+                check=True,
+            )
+            results[workers] = perf_counter() - start
+            with open(config["output"]["filepath"], mode="rb") as file:
+                outputs[workers] = file.read()
+
+    print(f"rows: {args.rows}, cpus: {cpu_count()}")
+    print(f"{'workers':>8} {'seconds':>9} {'speed-up':>9} {'output':>9}")
+    for workers, seconds in results.items():
+        same = outputs[workers] == outputs[args.workers[0]]
+        print(
+            f"{workers:>8} {seconds:>9.2f} "
+            f"{results[args.workers[0]] / seconds:>9.2f} "
+            f"{'same' if same else 'DIFFERS':>9}"
+        )
@@ -0,0 +1,14 @@
+from _downlinks.minimal import minimal_downlinks, parameter_of, parameters_of
+from _downlinks.packing import (
+    COMMAND_SIZES,
+    MAX_PAYLOAD_SIZES,
+    DownlinksPacker,
+    split_commands,
+)
+from _downlinks.reader import iter_servers
+from _downlinks.writer import (
+    DownlinksWriter,
+    JsonDownlinksWriter,
+    NdjsonDownlinksWriter,
+    open_downlinks_writer,
+)
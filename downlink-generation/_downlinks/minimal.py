@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional
+
+from _downlinks.packing import split_commands
+
+# length of the downlink prefix identifying the parameter it sets, by command
+# byte (uplink frequency, steam-trap-type, saturated steam temperature, noise
+# and steam-loss thresholds by steam-trap-type and index, counter thresholds)
+_PARAMETERS = {"01": 2, "0a": 2, "82": 2, "83": 6, "8d": 6, "84": 4, "85": 4}
+
+
+def parameter_of(downlink: str) -> Optional[str]:
+    """Identify the device parameter a downlink sets.
+
+    Args:
+        downlink (str): Hex-string of a downlink.
+
+    Returns:
+        Optional[str]: Parameter key, None for commands which don't set a
+            parameter (e.g. counters reset).
+    """
+    n = _PARAMETERS.get(downlink[:2].lower())
+    return downlink[:n].lower() if n else None
+
+
+def parameters_of(downlinks: List[str]) -> Dict[str, str]:
+    """Map the parameters of a downlink sequence to the command setting
+    them last (e.g. the final uplink frequency, not the temporary one).
+
+    Packed downlinks (see _downlinks.packing) are split into their commands
+    first, so a packed output can be used as state as well.
+
+    Args:
+        downlinks (List[str]): Ordered (possibly packed) downlinks.
+
+    Returns:
+        Dict[str, str]: Commands by parameter key.
+    """
+    parameters: Dict[str, str] = {}
+    for downlink in downlinks:
+        for command in split_commands(downlink) or [downlink]:
+            parameter = parameter_of(command)
+            if parameter is not None:
+                parameters[parameter] = command.lower()
+    return parameters
+
+
+def minimal_downlinks(
+    downlinks: List[str], applied: Optional[List[str]]
+) -> List[str]:
+    """Reduce a full downlink sequence to the parameters which changed
+    compared to the configuration applied last.
+
+    The temporary uplink frequency, commands (counters reset) and the final
+    uplink frequency frame the changed parameters like in the full
+    sequence. If only the final uplink frequency changed, it is the only
+    downlink, if nothing changed there are none.
+
+    Args:
+        downlinks (List[str]): Full ordered downlinks (hex-strings).
+        applied (Optional[List[str]]): Full ordered (possibly packed)
+            downlinks applied last, None if unknown (the full sequence is
+            kept).
+
+    Returns:
+        List[str]: Minimal ordered downlinks.
+    """
+    if applied is None:
+        return downlinks
+    current = parameters_of(applied)
+    target = parameters_of(downlinks)
+    changed = {
+        parameter
+        for parameter, downlink in target.items()
+        if current.get(parameter) != downlink
+    }
+    if not changed:
+        return []
+    if changed == {"01"}:
+        return [target["01"]]
+    minimal: List[str] = []
+    for downlink in downlinks:
+        parameter = parameter_of(downlink)
+        if parameter is None or parameter == "01" or parameter in changed:
+            minimal.append(downlink)
+    return minimal
@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional, Tuple
+
+# size in bytes of the MSB commands by command byte (uplink frequency,
+# counters reset, steam-trap-type, saturated steam temperature, noise and
+# steam-loss thresholds, counter thresholds)
+COMMAND_SIZES: Dict[str, int] = {
+    "01": 4,
+    "04": 2,
+    "0a": 2,
+    "82": 2,
+    "83": 4,
+    "8d": 4,
+    "84": 4,
+    "85": 4,
+}
+
+# max. application payload size in bytes by LoRaWAN data rate (EU868,
+# repeater compatible, without MAC commands in FOpts)
+MAX_PAYLOAD_SIZES: Dict[int, int] = {
+    0: 51,
+    1: 51,
+    2: 51,
+    3: 115,
+    4: 222,
+    5: 222,
+    6: 222,
+    7: 222,
+}
+
+
+def split_commands(payload: str) -> Optional[List[str]]:
+    """Split a (packed) downlink payload into its MSB commands.
+
+    Args:
+        payload (str): Hex-string of a downlink.
+
+    Returns:
+        Optional[List[str]]: Commands in payload order, None if the payload
+            doesn't follow the known command grammar.
+    """
+    commands: List[str] = []
+    position = 0
+    while position < len(payload):
+        size = COMMAND_SIZES.get(payload[position : position + 2].lower())
+        end = position + 2 * size if size else len(payload) + 1
+        if end > len(payload):
+            return None
+        commands.append(payload[position:end])
+        position = end
+    return commands
+
+
+class DownlinksPacker:
+    """Pack consecutive MSB commands into fewer downlinks.
+
+    Commands are concatenated in order as long as the payload fits the max.
+    payload size, the device executes them one after another. Downlinks
+    which don't follow the known command grammar are kept as they are (own
+    downlink). Packing is idempotent, already packed payloads are split and
+    packed again.
+    """
+
+    def __init__(self, max_size: int, cache: bool = True) -> None:
+        """Set up the packer.
+
+        Args:
+            max_size (int): Max. payload size in bytes.
+            cache (bool, optional): Memoize packed downlink sequences.
+                Defaults to True.
+
+        Raises:
+            ValueError: Raised if the max. payload size can't hold the
+                largest command.
+        """
+        if max_size < max(COMMAND_SIZES.values()):
+            raise ValueError(f"Max. payload size {max_size} is too small.")
+        self.max_size = max_size
+        self._cache: Optional[Dict[Tuple[str, ...], List[str]]] = (
+            {} if cache else None
+        )
+
+    def pack(self, downlinks: List[str]) -> List[str]:
+        """Pack a downlink sequence.
+
+        Args:
+            downlinks (List[str]): Ordered downlinks (hex-strings).
+
+        Returns:
+            List[str]: Ordered packed downlinks (shared if cached, don't
+                modify).
+        """
+        if self._cache is None:
+            return self._pack(downlinks)
+        key = tuple(downlinks)
+        packed = self._cache.get(key)
+        if packed is None:
+            packed = self._cache[key] = self._pack(downlinks)
+        return packed
+
+    def _pack(self, downlinks: List[str]) -> List[str]:
+        packed: List[str] = []
+        payload = ""
+        for downlink in downlinks:
+            commands = split_commands(downlink)
+            if commands is None:  # unknown grammar, keep as it is
+                if payload:
+                    packed.append(payload)
+                packed.append(downlink)
+                payload = ""
+                continue
+            for command in commands:
+                if len(payload) + len(command) > 2 * self.max_size:
+                    packed.append(payload)
+                    payload = ""
+                payload += command
+        if payload:
+            packed.append(payload)
+        return packed
@@ -0,0 +1,182 @@
+from array import array
+from json import JSONDecodeError, JSONDecoder, load as json_load, loads
+from re import compile as compile_regex_pattern
+from typing import Any, Dict, Iterator, List, Optional
+
+# start of the nested json format ({"server": [...]} or {"profiles": [...],
+# "server": [...]}) or of the first NDJSON record ({"server":0,...})
+_HEAD = compile_regex_pattern(r'\s*\{\s*"(server|profiles?)"\s*:\s*(\[|\d)')
+_HEAD_SIZE = 256  # characters read to detect the format
+_SEPARATORS = " \t\n\r,"  # between the server blocks
+
+
+def iter_servers(
+    filepath: str, chunksize: int = 1 << 16
+) -> Iterator[Dict[str, Any]]:
+    """Stream the server blocks of a downlinks file one after another.
+
+    The format (nested json or NDJSON, see _downlinks.writer) is detected by
+    the content. Each server block is complete (incl. all its downlinks)
+    when it is yielded, but only the blocks yielded so far have been parsed.
+    Devices referring to configuration profiles get the downlinks of their
+    profile (shared, read-only lists).
+
+    Args:
+        filepath (str): Absolute or relative filepath to downlinks file.
+        chunksize (int, optional): Characters read at once.
+            Defaults to 65536.
+
+    Yields:
+        Iterator[Dict[str, Any]]: Server blocks (address, credentials,
+            downlinkSettings and downlinks).
+    """
+    with open(file=filepath, mode="r", encoding="utf-8") as file:
+        head = _HEAD.match(file.read(_HEAD_SIZE))
+    if head is None:  # unknown layout, parse as a whole
+        with open(file=filepath, mode="r", encoding="utf-8") as file:
+            content = json_load(fp=file)
+        profiles = content.get("profiles")
+        for block in content["server"]:
+            yield _resolve_profiles(block, profiles)
+    elif head.group(1) == "profile" or head.group(2) != "[":
+        yield from _iter_ndjson_servers(filepath)
+    else:
+        yield from _iter_json_servers(filepath, max(chunksize, 1))
+
+
+def _resolve_profiles(
+    block: Dict[str, Any], profiles: Optional[List[List[str]]]
+) -> Dict[str, Any]:
+    """Replace the profile numbers of a server block by their downlinks.
+
+    Args:
+        block (Dict[str, Any]): Server block.
+        profiles (Optional[List[List[str]]]): Configuration profiles.
+
+    Returns:
+        Dict[str, Any]: Server block with downlinks.
+    """
+    if "devices" in block:
+        block["downlinks"] = {
+            dev_eui: profiles[profile]
+            for dev_eui, profile in block.pop("devices").items()
+        }
+    return block
+
+
+def _iter_json_servers(
+    filepath: str, chunksize: int
+) -> Iterator[Dict[str, Any]]:
+    """Stream the server blocks of the nested json format.
+
+    Args:
+        filepath (str): Absolute or relative filepath to downlinks file.
+        chunksize (int): Characters read at once.
+
+    Raises:
+        ValueError: Raised if the header is malformed or the file is
+            truncated or invalid json.
+
+    Yields:
+        Iterator[Dict[str, Any]]: Server blocks.
+    """
+    decoder = JSONDecoder()
+    profiles: Optional[List[List[str]]] = None
+    with open(file=filepath, mode="r", encoding="utf-8") as file:
+        # the header is read completely at once (also with small chunks)
+        buffer = file.read(max(chunksize, _HEAD_SIZE))
+        head = _HEAD.match(buffer)
+        if head is None or head.group(2) != "[":
+            raise ValueError(f"Invalid header of '{filepath}'.")
+        if head.group(1) == "profiles":  # preceding the server blocks
+            position = head.start(2)
+            while True:
+                try:
+                    profiles, end = decoder.raw_decode(buffer, position)
+                    break
+                except JSONDecodeError:  # profiles not read completely yet
+                    content = file.read(max(chunksize, len(buffer)))
+                    if not content:
+                        raise ValueError(f"Truncated or invalid '{filepath}'.")
+                    buffer += content
+            buffer = buffer[end:]
+            while "[" not in buffer:
+                content = file.read(chunksize)
+                if not content:
+                    raise ValueError(f"Truncated or invalid '{filepath}'.")
+                buffer += content
+        position = buffer.index("[") + 1
+        while True:
+            while position < len(buffer) and buffer[position] in _SEPARATORS:
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                if position == len(buffer):
+                    raise JSONDecodeError("Incomplete", buffer, position)
+                block, end = decoder.raw_decode(buffer, position)
+            except JSONDecodeError:  # block not read completely yet
+                # read at least as much as buffered (linear, not quadratic)
+                content = file.read(max(chunksize, len(buffer) - position))
+                if not content:
+                    raise ValueError(f"Truncated or invalid '{filepath}'.")
+                buffer, position = buffer[position:] + content, 0
+                continue
+            yield _resolve_profiles(block, profiles)
+            buffer, position = buffer[end:], 0
+
+
+def _iter_ndjson_servers(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Stream the server blocks of the NDJSON format.
+
+    A first pass only locates the records of each server (without parsing
+    the downlinks), afterwards the device records are parsed server by
+    server. Configuration profiles are kept in memory during the first pass.
+
+    Args:
+        filepath (str): Absolute or relative filepath to downlinks file.
+
+    Yields:
+        Iterator[Dict[str, Any]]: Server blocks.
+    """
+    blocks: List[Dict[str, Any]] = []
+    offsets: List[array] = []  # device record offsets per server
+    profiles: Dict[int, List[str]] = {}
+    with open(file=filepath, mode="rb") as file:
+        offset = 0
+        for line in file:
+            # fast path for records written by NdjsonDownlinksWriter
+            comma = line.find(b",")
+            if line.startswith(b'{"server":') and line[10:comma].isdigit():
+                server = int(line[10:comma])
+                device = line.startswith(b'"devEUI"', comma + 1)
+            elif line.strip():
+                record = loads(line)
+                if "profile" in record and "server" not in record:
+                    profiles[record["profile"]] = record["downlinks"]
+                    offset += len(line)
+                    continue
+                server, device = record["server"], "devEUI" in record
+            else:  # empty line
+                offset += len(line)
+                continue
+            if device:
+                offsets[server].append(offset)
+            else:
+                block = loads(line)
+                del block["server"]
+                block["downlinks"] = {}
+                blocks.append(block)
+                offsets.append(array("q"))
+            offset += len(line)
+        for server in range(len(blocks)):  # release yielded blocks
+            block, blocks[server] = blocks[server], None
+            for offset in offsets[server]:
+                file.seek(offset)
+                record = loads(file.readline())
+                block["downlinks"][record["devEUI"]] = (
+                    record["downlinks"]
+                    if "downlinks" in record
+                    else profiles[record["profile"]]
+                )
+            yield block
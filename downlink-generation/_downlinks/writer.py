@@ -0,0 +1,295 @@
+from array import array
+from json import dumps as json_dumps
+from os import makedirs, path as pathfx, remove, replace
+from tempfile import TemporaryFile
+from typing import Any, Dict, List, Optional, Tuple
+
+_MARK = "\x00"  # placeholder of the nested json parts
+
+
+class DownlinksWriter:
+    """Streamed writer of generated downlinks (server blocks and devices).
+
+    Server blocks and device entries are written as they are produced, so
+    the memory usage doesn't depend on the number of devices. The output is
+    written to `<filepath>.tmp` and only replaces the output file once it
+    is complete (close), an aborted run keeps the previous output intact.
+
+    With `profiles` identical downlink lists are stored once as numbered
+    configuration profiles and the devices refer to their profile number
+    (see _downlinks.reader, which resolves them again).
+    """
+
+    def __init__(self, filepath: str, profiles: bool = False) -> None:
+        """Open the temporary output file.
+
+        Args:
+            filepath (str): Absolute or relative filepath to output file.
+            profiles (bool, optional): Store unique downlink lists once
+                (configuration profiles). Defaults to False.
+        """
+        self.filepath = filepath
+        self.profiles = profiles
+        self.servers = 0
+        self.devices = 0
+        self.closed = False
+        self._profiles: Dict[Tuple[str, ...], int] = {}
+        directory = pathfx.dirname(filepath)
+        if directory:
+            makedirs(directory, exist_ok=True)
+        self._tmp = f"{filepath}.tmp"
+        self._file = open(file=self._tmp, mode="wb")
+
+    def __enter__(self) -> "DownlinksWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_server(self, block: Dict[str, Any]) -> int:
+        """Add a server block (address, credentials and downlinkSettings).
+
+        Args:
+            block (Dict[str, Any]): Server block without downlinks.
+
+        Returns:
+            int: Server number to add the devices to.
+        """
+        self.servers += 1
+        return self.servers - 1
+
+    def add_device(
+        self, server: int, dev_eui: str, downlinks: List[str]
+    ) -> None:
+        """Add the downlinks of a device.
+
+        Args:
+            server (int): Server number (see add_server).
+            dev_eui (str): Extended unique identifier (EUI) of the device.
+            downlinks (List[str]): Ordered downlinks (hex-strings).
+        """
+        self.devices += 1
+
+    def _profile(self, downlinks: List[str]) -> Tuple[int, bool]:
+        """Look up (or number) the configuration profile of downlinks.
+
+        Args:
+            downlinks (List[str]): Ordered downlinks (hex-strings).
+
+        Returns:
+            Tuple[int, bool]: Profile number and whenever it is new.
+        """
+        key = tuple(downlinks)
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = len(self._profiles)
+            return profile, True
+        return profile, False
+
+    def _finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Complete the output file and replace the previous output."""
+        if self.closed:
+            return
+        self._finish()
+        self._file.close()
+        replace(self._tmp, self.filepath)
+        self.closed = True
+
+    def abort(self) -> None:
+        """Discard the output (previous output is kept)."""
+        if self.closed:
+            return
+        self._file.close()
+        remove(self._tmp)
+        self.closed = True
+
+
+class JsonDownlinksWriter(DownlinksWriter):
+    """Writer of the nested json format (same output as json.dump).
+
+    Device entries are serialized as they are produced into an anonymous
+    spool file, only their offsets are kept in memory. The server blocks
+    are assembled from the spooled entries when the writer is closed.
+
+    With profiles the output is `{"profiles": [[...], ...], "server": [{...,
+    "devices": {<DevEUI>: <profile>, ...}}]}` instead of per device
+    downlinks.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        indent: Optional[int] = None,
+        profiles: bool = False,
+    ) -> None:
+        """Open the temporary output and spool file.
+
+        Args:
+            filepath (str): Absolute or relative filepath to output file.
+            indent (Optional[int], optional): Json indentation (see
+                json.dump). Defaults to None (compact, single line).
+            profiles (bool, optional): Store unique downlink lists once
+                (configuration profiles). Defaults to False.
+        """
+        super().__init__(filepath, profiles=profiles)
+        self.indent = indent
+        self._blocks: List[Dict[str, Any]] = []
+        self._offsets: List[array] = []  # (start, length) per device
+        self._spool = TemporaryFile(mode="w+b")
+
+    def _nest(self, text: str, level: int) -> str:
+        if self.indent is None:
+            return text
+        return text.replace("\n", "\n" + " " * (self.indent * level))
+
+    def _separator(self, level: int) -> str:
+        if self.indent is None:
+            return ", "
+        return ",\n" + " " * (self.indent * level)
+
+    def _split(self, obj: Any, level: int) -> List[str]:
+        text = json_dumps(obj, indent=self.indent)
+        return self._nest(text, level).split(json_dumps(_MARK))
+
+    def add_server(self, block: Dict[str, Any]) -> int:
+        self._blocks.append(block)
+        self._offsets.append(array("q"))
+        return super().add_server(block)
+
+    def add_device(
+        self, server: int, dev_eui: str, downlinks: List[str]
+    ) -> None:
+        if self.profiles:
+            value = str(self._profile(downlinks)[0])
+        else:
+            value = self._nest(json_dumps(downlinks, indent=self.indent), 4)
+        entry = (
+            (self._separator(4) if self._offsets[server] else "")
+            + json_dumps(dev_eui)
+            + ": "
+            + value
+        ).encode()
+        self._offsets[server].extend((self._spool.tell(), len(entry)))
+        self._spool.write(entry)
+        super().add_device(server, dev_eui, downlinks)
+
+    def _copy_entries(self, offsets: array) -> None:
+        """Copy the spooled entries of a server (adjoining ones at once)."""
+        if not offsets:
+            return
+        start = end = offsets[0]
+        for i in range(0, len(offsets), 2):
+            if offsets[i] != end:
+                self._spool.seek(start)
+                self._file.write(self._spool.read(end - start))
+                start = offsets[i]
+            end = offsets[i] + offsets[i + 1]
+        self._spool.seek(start)
+        self._file.write(self._spool.read(end - start))
+
+    def _finish(self) -> None:
+        root: Dict[str, Any] = {}
+        if self.profiles:
+            root["profiles"] = [list(key) for key in self._profiles]
+        if not self._blocks:
+            text = json_dumps({**root, "server": []}, indent=self.indent)
+            self._file.write(text.encode())
+            self._spool.close()
+            return
+        head, tail = self._split({**root, "server": [_MARK]}, 0)
+        self._file.write(head.encode())
+        key = "devices" if self.profiles else "downlinks"
+        for server, block in enumerate(self._blocks):
+            if server:
+                self._file.write(self._separator(2).encode())
+            # {_MARK: _MARK} is replaced by the spooled device entries
+            _head, _, _tail = self._split({**block, key: {_MARK: _MARK}}, 2)
+            self._file.write(_head.encode())
+            self._copy_entries(self._offsets[server])
+            self._file.write(_tail.encode())
+        self._file.write(tail.encode())
+        self._spool.close()
+
+    def abort(self) -> None:
+        self._spool.close()
+        super().abort()
+
+
+class NdjsonDownlinksWriter(DownlinksWriter):
+    """Writer of the NDJSON format (one json record per line).
+
+    Each server block is written as a line `{"server": n, "address": ...}`
+    as soon as it is created, each device as `{"server": n, "devEUI": ...,
+    "downlinks": [...]}` as soon as it is built (compact, no indentation).
+
+    With profiles each new downlink list is written once as `{"profile": n,
+    "downlinks": [...]}` before the first device `{"server": n, "devEUI":
+    ..., "profile": n}` referring to it.
+    """
+
+    def add_server(self, block: Dict[str, Any]) -> int:
+        server = super().add_server(block)
+        self._write({"server": server, **block})
+        return server
+
+    def add_device(
+        self, server: int, dev_eui: str, downlinks: List[str]
+    ) -> None:
+        if self.profiles:
+            profile, new = self._profile(downlinks)
+            if new:
+                self._write({"profile": profile, "downlinks": downlinks})
+            self._write(
+                {"server": server, "devEUI": dev_eui, "profile": profile}
+            )
+        else:
+            self._write(
+                {"server": server, "devEUI": dev_eui, "downlinks": downlinks}
+            )
+        super().add_device(server, dev_eui, downlinks)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(
+            json_dumps(record, separators=(",", ":")).encode() + b"\n"
+        )
+
+
+def open_downlinks_writer(
+    filepath: str,
+    fmt: Optional[str] = None,
+    indent: Optional[int] = None,
+    profiles: bool = False,
+) -> DownlinksWriter:
+    """Open the streamed downlinks writer of the output format.
+
+    Args:
+        filepath (str): Absolute or relative filepath to output file.
+        fmt (Optional[str], optional): Output format "json" or "ndjson".
+            Defaults to None (detected by file extension, .ndjson or .jsonl
+            for ndjson, else json).
+        indent (Optional[int], optional): Json indentation (json format
+            only). Defaults to None.
+        profiles (bool, optional): Store unique downlink lists once
+            (configuration profiles). Defaults to False.
+
+    Raises:
+        ValueError: Raised if the output format is not supported.
+
+    Returns:
+        DownlinksWriter: Writer (context manager, closed on success).
+    """
+    if fmt is None:
+        fmt = pathfx.splitext(filepath.strip())[1].lstrip(".")
+        fmt = "ndjson" if fmt.lower() in ("ndjson", "jsonl") else "json"
+    fmt = fmt.strip().lower()
+    if fmt == "json":
+        return JsonDownlinksWriter(filepath, indent=indent, profiles=profiles)
+    elif fmt in ("ndjson", "jsonl"):
+        return NdjsonDownlinksWriter(filepath, profiles=profiles)
+    raise ValueError(f"Unsupported output format '{fmt}' (json | ndjson).")
@@ -0,0 +1,3 @@
+from _lookup.cache import read_tables_cache, write_tables_cache
+from _lookup.conftable import ConfTableIndex
+from _lookup.pttable import PTTable
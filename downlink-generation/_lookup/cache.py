@@ -0,0 +1,93 @@
+from hashlib import sha256
+from os import makedirs, path as pathfx, replace, stat
+from pickle import dump as pickle_dump, load as pickle_load, HIGHEST_PROTOCOL
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from pandas import DataFrame
+
+CACHE_VERSION = 1  # increase if the pre-processing of the tables changes
+
+
+def _workbook_signature(filepath: str) -> Dict[str, Any]:
+    """Get quick (size, mtime) signature of the look-up tables workbook.
+
+    Args:
+        filepath (str): Absolute or relative filepath to xlsx file.
+
+    Returns:
+        Dict[str, Any]: File size in bytes and modification time in ns.
+    """
+    st = stat(filepath)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _workbook_hash(filepath: str) -> str:
+    """Get sha256 hex-digest of the look-up tables workbook.
+
+    Args:
+        filepath (str): Absolute or relative filepath to xlsx file.
+
+    Returns:
+        str: sha256 hex-digest of the file content.
+    """
+    with open(file=filepath, mode="rb") as xlsx_file:
+        return sha256(xlsx_file.read()).hexdigest()
+
+
+def read_tables_cache(
+    cachepath: str, filepath: str, sheets: Sequence[str]
+) -> Optional[Tuple[DataFrame, ...]]:
+    """Read pre-processed look-up tables from binary cache file.
+
+    The cache is valid if it has been created from the same workbook
+    content and sheets with the same cache version. If size and mtime of
+    the workbook are unchanged the content hash is not recomputed.
+
+    Args:
+        cachepath (str): Absolute or relative filepath to cache file.
+        filepath (str): Absolute or relative filepath to xlsx file.
+        sheets (Sequence[str]): Sheet names of the cached tables.
+
+    Returns:
+        Optional[Tuple[DataFrame, ...]]: Cached tables or None if there is
+            no valid cache for the given workbook.
+    """
+    if not pathfx.isfile(cachepath):
+        return None
+    with open(file=cachepath, mode="rb") as cache_file:
+        cache: Dict[str, Any] = pickle_load(cache_file)
+    if cache["version"] != CACHE_VERSION or cache["sheets"] != list(sheets):
+        return None
+    if cache["signature"] != _workbook_signature(filepath):
+        if cache["sha256"] != _workbook_hash(filepath):
+            return None
+    return cache["tables"]
+
+
+def write_tables_cache(
+    cachepath: str,
+    filepath: str,
+    sheets: Sequence[str],
+    tables: Tuple[DataFrame, ...],
+) -> None:
+    """Write pre-processed look-up tables to binary cache file.
+
+    Args:
+        cachepath (str): Absolute or relative filepath to cache file.
+        filepath (str): Absolute or relative filepath to xlsx file.
+        sheets (Sequence[str]): Sheet names of the cached tables.
+        tables (Tuple[DataFrame, ...]): Pre-processed tables.
+    """
+    directory = pathfx.dirname(cachepath)
+    if directory:
+        makedirs(directory, exist_ok=True)
+    cache = {
+        "version": CACHE_VERSION,
+        "sheets": list(sheets),
+        "signature": _workbook_signature(filepath),
+        "sha256": _workbook_hash(filepath),
+        "tables": tuple(tables),
+    }
+    with open(file=f"{cachepath}.tmp", mode="wb") as cache_file:
+        pickle_dump(cache, cache_file, protocol=HIGHEST_PROTOCOL)
+    replace(f"{cachepath}.tmp", cachepath)  # atomic, no half-written cache
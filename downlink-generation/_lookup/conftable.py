@@ -0,0 +1,111 @@
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from pandas import DataFrame
+
+
+class ConfTableIndex:
+    """Pre-built look-up index over the decision params table (Conf-Table).
+
+    Rows are hashed by their categorical match params. The closed pressure
+    intervals [p-min, p-max] of all rows sharing the same key are resolved
+    into sorted breakpoints, so a device resolves with a dict access and a
+    bisect instead of a full table scan. If several intervals of a key
+    overlap, the first row in table order wins (same as a linear scan).
+    """
+
+    def __init__(
+        self,
+        table: DataFrame,
+        keys: Sequence[str] = (
+            "steam-trap-type",
+            "mounting-type",
+            "hardware-model",
+            "condensate-load",
+        ),
+        pmin: str = "p-min",
+        pmax: str = "p-max",
+    ) -> None:
+        """Build the index.
+
+        Args:
+            table (DataFrame): Decision params table with normalized columns.
+            keys (Sequence[str], optional): Categorical match params.
+                Defaults to steam-trap-type, mounting-type, hardware-model
+                and condensate-load.
+            pmin (str, optional): Lower pressure bound column name.
+                Defaults to "p-min".
+            pmax (str, optional): Upper pressure bound column name.
+                Defaults to "p-max".
+        """
+        self.keys: Tuple[str, ...] = tuple(keys)
+        groups: Dict[Tuple[Hashable, ...], List[Tuple[Any, Any, Any]]] = {}
+        for label, *values, p_min, p_max in zip(
+            table.index.tolist(),
+            *(table[key].tolist() for key in self.keys),
+            table[pmin].tolist(),
+            table[pmax].tolist(),
+        ):
+            groups.setdefault(tuple(values), []).append((p_min, p_max, label))
+        self._index: Dict[
+            Tuple[Hashable, ...],
+            Tuple[List[Any], List[Optional[Any]], List[Optional[Any]]],
+        ] = {key: self._resolve(rows) for key, rows in groups.items()}
+
+    @staticmethod
+    def _resolve(
+        rows: List[Tuple[Any, Any, Any]]
+    ) -> Tuple[List[Any], List[Optional[Any]], List[Optional[Any]]]:
+        """Resolve (possibly overlapping) closed intervals of a single key.
+
+        Args:
+            rows (List[Tuple[Any, Any, Any]]): (p-min, p-max, label) tuples
+                in table order.
+
+        Returns:
+            Tuple[List[Any], List[Optional[Any]], List[Optional[Any]]]:
+                Sorted breakpoints, winning label on each breakpoint and
+                winning label on each open gap between two breakpoints.
+        """
+        bounds = sorted(
+            {p for p_min, p_max, _ in rows for p in (p_min, p_max)}
+        )
+        points: List[Optional[Any]] = [None] * len(bounds)
+        gaps: List[Optional[Any]] = [None] * max(len(bounds) - 1, 0)
+        for p_min, p_max, label in reversed(rows):  # first row wins
+            lo, hi = bounds.index(p_min), bounds.index(p_max)
+            for i in range(lo, hi + 1):
+                points[i] = label
+            for i in range(lo, hi):
+                gaps[i] = label
+        return bounds, points, gaps
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(
+        self, key: Tuple[Hashable, ...], pressure: int | float
+    ) -> Optional[Any]:
+        """Find the matching table row label.
+
+        Args:
+            key (Tuple[Hashable, ...]): Device values of the match params
+                (same order as `keys`).
+            pressure (int | float): Differential pressure of the device.
+
+        Returns:
+            Optional[Any]: Index label of the matching table row or None if
+                there is no full-match.
+        """
+        try:
+            bounds, points, gaps = self._index[key]
+        except (KeyError, TypeError):  # TypeError: unhashable values
+            return None
+        if pressure != pressure:  # NaN never lies inside an interval
+            return None
+        i = bisect_left(bounds, pressure)
+        if i < len(bounds) and bounds[i] == pressure:
+            return points[i]
+        if 0 < i < len(bounds):
+            return gaps[i - 1]
+        return None
@@ -0,0 +1,107 @@
+from typing import Any, Dict, Optional, Tuple
+
+from numpy import abs as np_abs, argsort, clip, isnan, ndarray, unique, where
+from pandas import DataFrame
+
+
+class PTTable:
+    """Saturated steam pressure-temperature look-up (P-T-Table).
+
+    The table is loaded once into sorted numpy arrays and the nearest
+    pressure is found by binary search (`searchsorted`) instead of scanning
+    the whole table. Ties are resolved like `Series.idxmin`, i.e. the row
+    which comes first in table order wins.
+    """
+
+    def __init__(
+        self,
+        table: DataFrame,
+        pressure: str = "p-bar",
+        temperature: str = "t-celsius",
+        cache: bool = True,
+    ) -> None:
+        """Load the look-up arrays.
+
+        Args:
+            table (DataFrame): P-T-Table with normalized columns.
+            pressure (str, optional): Pressure column name.
+                Defaults to "p-bar".
+            temperature (str, optional): Temperature column name.
+                Defaults to "t-celsius".
+            cache (bool, optional): Memoize look-ups by pressure.
+                Defaults to True.
+        """
+        table = table[table[pressure].notna()]  # idxmin skips NaN's
+        p = table[pressure].to_numpy()
+        t = table[temperature].to_numpy()
+        # unique sorted pressures and the first row (table order) of each
+        order = argsort(p, kind="stable")
+        self._p, first = unique(p[order], return_index=True)
+        self._t = t[order[first]]
+        self._pos = order[first]
+        self._cache: Optional[Dict[Any, Tuple[Any, Any]]] = (
+            {} if cache else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._p)
+
+    def _nearest(self, pressures: ndarray) -> ndarray:
+        """Find positions (in the sorted arrays) of the nearest pressures.
+
+        Args:
+            pressures (ndarray): Pressures to look up.
+
+        Returns:
+            ndarray: Positions of the nearest pressures.
+        """
+        right = clip(self._p.searchsorted(pressures), 0, len(self._p) - 1)
+        left = clip(right - 1, 0, None)
+        d_left = np_abs(self._p[left] - pressures)
+        d_right = np_abs(self._p[right] - pressures)
+        return where(
+            (d_left < d_right)
+            | ((d_left == d_right) & (self._pos[left] < self._pos[right])),
+            left,
+            right,
+        )
+
+    def lookup(self, pressure: int | float) -> Tuple[Any, Any]:
+        """Look up the nearest pressure and its saturated steam temperature.
+
+        Args:
+            pressure (int | float): Pressure in the unit of the table.
+
+        Raises:
+            ValueError: Raised if pressure is NaN.
+
+        Returns:
+            Tuple[Any, Any]: Nearest pressure and corresponding temperature.
+        """
+        if self._cache is not None and pressure in self._cache:
+            return self._cache[pressure]
+        if pressure != pressure:
+            raise ValueError("Can't look up temperature of NaN pressure.")
+        i = self._nearest(pressure)
+        result = (self._p[i], self._t[i])
+        if self._cache is not None:
+            self._cache[pressure] = result
+        return result
+
+    def lookup_many(self, pressures: ndarray) -> Tuple[ndarray, ndarray]:
+        """Look up nearest pressures and temperatures column-wise.
+
+        Args:
+            pressures (ndarray): Pressures in the unit of the table.
+
+        Raises:
+            ValueError: Raised if any pressure is NaN.
+
+        Returns:
+            Tuple[ndarray, ndarray]: Nearest pressures and corresponding
+                temperatures.
+        """
+        if isnan(pressures).any():
+            raise ValueError("Can't look up temperature of NaN pressure.")
+        i = self._nearest(pressures)
+        return self._p[i], self._t[i]
@@ -1,2 +1,11 @@
+from _types.described import DescribedIntEnum
 from _types.mounting import MountingTypes
+from _types.records import (
+    ConfRecord,
+    DeviceRecord,
+    conf_records,
+    device_records,
+    match_key,
+    resolve_types,
+)
 from _types.steamtraps import SteamTrapTypes
@@ -0,0 +1,112 @@
+from enum import IntEnum
+from typing import Any, Dict
+
+from numpy import array
+from pandas import factorize, Series
+
+# reverse maps of the members (see DescribedIntEnum.build_reverse_maps)
+_BY = ("phrase", "description", "alias")
+
+
+class DescribedIntEnum(IntEnum):
+    """IntEnum whose members carry a phrase (abbreviation) and description.
+
+    Members are looked up by phrase or description through reverse maps
+    built once per enum (`build_reverse_maps`, right after the class), so a
+    look-up is a dict access instead of a scan over all members. Look-ups
+    ignore surrounding whitespace and case, `alias` accepts both the
+    phrase and the description.
+    """
+
+    def __new__(cls, value: int, phrase: str, description: str):
+        obj = int.__new__(cls, value)
+        obj._value_ = value
+
+        obj.phrase = phrase
+        obj.description = description
+        return obj
+
+    @classmethod
+    def build_reverse_maps(cls) -> None:
+        """Build the reverse maps by phrase, description and alias (both)."""
+        maps: Dict[str, Dict[str, Any]] = {by: {} for by in _BY}
+        for member in cls:
+            for by in ("phrase", "description"):
+                for key in (getattr(member, by), getattr(member, by).lower()):
+                    maps[by].setdefault(key, member)
+                    maps["alias"].setdefault(key, member)
+        cls._reverse_maps = maps
+
+    @classmethod
+    def _lookup(cls, value: Any, by: str) -> "DescribedIntEnum":
+        members = cls._reverse_maps[by]
+        try:
+            return members[value]  # exact phrase or description
+        except KeyError:
+            return members[value.strip().lower()]
+
+    @classmethod
+    def get_member_by_phrase(cls, _phrase: str, /) -> "DescribedIntEnum":
+        try:
+            return cls._lookup(_phrase, "phrase")
+        except KeyError:
+            raise KeyError(f"There is no member with such phrase.") from None
+
+    @classmethod
+    def get_member_by_description(
+        cls, _description: str, /
+    ) -> "DescribedIntEnum":
+        try:
+            return cls._lookup(_description, "description")
+        except KeyError:
+            raise KeyError(
+                f"There is no member with such description."
+            ) from None
+
+    @classmethod
+    def get_member(cls, _alias: str, /) -> "DescribedIntEnum":
+        try:
+            return cls._lookup(_alias, "alias")
+        except KeyError:
+            raise KeyError(f"There is no member with such alias.") from None
+
+    @classmethod
+    def from_series(
+        cls, series: Series, by: str = "alias", errors: str = "raise"
+    ) -> Series:
+        """Map a whole column to members, each distinct value is looked up
+        once.
+
+        Args:
+            series (Series): Column of phrases and/or descriptions.
+            by (str, optional): Reverse map "phrase", "description" or
+                "alias" (both). Defaults to "alias".
+            errors (str, optional): Unknown values (incl. NaN) "raise" a
+                KeyError, are kept as they are ("ignore") or become None
+                ("coerce"). Defaults to "raise".
+
+        Raises:
+            KeyError: Raised if a value has no member (errors="raise").
+
+        Returns:
+            Series: Members (object dtype, same index and name as `series`).
+        """
+        codes, uniques = factorize(series)
+        members = array([None] * (len(uniques) + 1), dtype=object)
+        for i, value in enumerate(uniques):
+            try:
+                members[i] = cls._lookup(value, by)
+            except (AttributeError, KeyError):
+                if errors == "raise":
+                    raise KeyError(
+                        f"There is no member with such {by}: {value!r}."
+                    ) from None
+                members[i] = value if errors == "ignore" else None
+        values = members[codes]  # -1 (NaN) takes the trailing None
+        if (codes == -1).any():
+            if errors == "raise":
+                raise KeyError(f"There is no member with such {by}: nan.")
+            if errors == "ignore":
+                missing = codes == -1
+                values[missing] = series.to_numpy(dtype=object)[missing]
+        return Series(values, index=series.index, name=series.name)
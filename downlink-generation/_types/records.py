@@ -0,0 +1,144 @@
+from typing import Any, Dict, Hashable, List, NamedTuple, Tuple
+
+from pandas import DataFrame, Series
+
+from _types.mounting import MountingTypes
+from _types.steamtraps import SteamTrapTypes
+
+
+class DeviceRecord(NamedTuple):
+    """Device specifications (input row) with resolved enum members."""
+
+    label: Hashable
+    deveui: Any
+    server: Any
+    steam_trap_type: SteamTrapTypes | Any
+    mounting_type: MountingTypes | Any
+    hardware_model: Any
+    dn: Any
+    differential_pressure: Any
+    application: Any = None
+    condensate_load: Any = None
+    twkup: Any = None
+    defective_warning: Any = None
+    defective_alarm: Any = None
+
+
+class ConfRecord(NamedTuple):
+    """Decision params row (Conf-Table) with resolved enum members, the
+    optional counter thresholds and twkup fall back to their defaults."""
+
+    label: Hashable
+    steam_trap_type: SteamTrapTypes | Any
+    mounting_type: MountingTypes | Any
+    hardware_model: Any
+    p_min: Any
+    p_max: Any
+    condensate_load: Any
+    tv: Any
+    lv: Any
+    slth0: Any
+    slval0: Any
+    slth1: Any
+    slval1: Any
+    slth2: Any
+    slval2: Any
+    defective_warning: Any = 360
+    defective_alarm: Any = 720
+    twkup: Any = 3600
+
+
+# enum columns (normalized column names) and the reverse map they use
+_ENUMS: Dict[str, Tuple[Any, str]] = {
+    "steam-trap-type": (SteamTrapTypes, "description"),
+    "mounting-type": (MountingTypes, "phrase"),
+}
+
+
+def _resolve(series: Series, enum: Any, by: str) -> Series:
+    members = enum.from_series(series, by=by, errors="ignore")
+    # members are IntEnums (equal to their int values), so unresolved
+    # non-strings (e.g. a numeric steam-trap-type) must not be kept
+    keep = [isinstance(value, (str, enum)) for value in members.tolist()]
+    return members.where(keep, None)
+
+
+def resolve_types(df: DataFrame) -> DataFrame:
+    """Resolve the enum columns (steam-trap-type and mounting-type).
+
+    Args:
+        df (DataFrame): Table with normalized columns.
+
+    Returns:
+        DataFrame: Copy with enum members (unknown strings kept as they are,
+            other unknown values become None and match no row).
+    """
+    return df.assign(
+        **{
+            column: _resolve(df[column], enum, by)
+            for column, (enum, by) in _ENUMS.items()
+            if column in df.columns
+        }
+    )
+
+
+def _records(df: DataFrame, record: Any) -> List[Any]:
+    """Convert a table column-wise into records.
+
+    Args:
+        df (DataFrame): Table with normalized columns.
+        record (Any): NamedTuple type with field names matching the
+            normalized column names ("-" replaced by "_", `label` for the
+            index labels). Missing columns take the field default.
+
+    Returns:
+        List[Any]: Records in table order.
+    """
+    df = resolve_types(df)
+    columns: Dict[str, Any] = {"label": df.index.tolist()}
+    for column in df.columns:
+        field = str(column).replace("-", "_")
+        if field in record._fields:
+            columns[field] = df[column].tolist()
+    defaults = record._field_defaults
+    values = [
+        columns[field] if field in columns else [defaults[field]] * len(df)
+        for field in record._fields
+    ]
+    return list(map(record._make, zip(*values)))
+
+
+def device_records(df: DataFrame) -> List[DeviceRecord]:
+    """Convert device specifications into records.
+
+    Args:
+        df (DataFrame): Pre-processed input specifications (devices).
+
+    Returns:
+        List[DeviceRecord]: Device records in table order.
+    """
+    return _records(df, DeviceRecord)
+
+
+def conf_records(df: DataFrame) -> Dict[Hashable, ConfRecord]:
+    """Convert the decision params table into records.
+
+    Args:
+        df (DataFrame): Decision params table with normalized columns.
+
+    Returns:
+        Dict[Hashable, ConfRecord]: Records by index label.
+    """
+    return {record.label: record for record in _records(df, ConfRecord)}
+
+
+def match_key(param: str) -> str:
+    """Record field name of a (normalized) match param column name.
+
+    Args:
+        param (str): Match param column name, e.g. "steam-trap-type".
+
+    Returns:
+        str: Record field name, e.g. "steam_trap_type".
+    """
+    return param.replace("-", "_")
@@ -1,5 +1,11 @@
+from argparse import ArgumentParser
+from atexit import register as register_atexit
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from cProfile import Profile
 from datetime import datetime
-from json import dump as json_dump, dumps
+from hashlib import sha1
+from json import dump as json_dump, dumps, load as json_load
 from logging import (
     getLogger,
     Logger,
@@ -8,16 +14,63 @@ from logging import (
     StreamHandler,
     DEBUG,
 )
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing import freeze_support
+from operator import attrgetter
 from os import getcwd, chdir, path as pathfx, mkdir
 from pathlib import Path
+from queue import Queue
 from re import compile as compile_regex_pattern
 from sys import stderr, stdout
-from typing import Any, Dict, List, Optional, Tuple
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from pandas import DataFrame, read_excel, Series
+from numpy import array, float64, full, int64, ndarray, where
+from openpyxl import load_workbook
+from pandas import (
+    DataFrame,
+    factorize,
+    RangeIndex,
+    read_csv,
+    read_excel,
+    Series,
+)
+from pandas.io.parsers import TextParser
 from yaml import SafeLoader as YAMLSafeLoader, load as yaml_load
 
-from _types import SteamTrapTypes
+from _downlinks import (
+    MAX_PAYLOAD_SIZES,
+    DownlinksPacker,
+    DownlinksWriter,
+    iter_servers,
+    minimal_downlinks,
+    open_downlinks_writer,
+)
+from _lookup import (
+    ConfTableIndex,
+    PTTable,
+    read_tables_cache,
+    write_tables_cache,
+)
+from _metrics import Metrics
+from _types import (
+    ConfRecord,
+    DeviceRecord,
+    SteamTrapTypes,
+    conf_records,
+    device_records,
+    match_key,
+    resolve_types,
+)
+
+_HEX_BYTES = array([f"{value:02x}" for value in range(256)], dtype=object)
+
+# timers and counters of the run (per process, see process_specs_worker)
+metrics = Metrics(prefix="gen_downlinks")
+# background thread of the asynchronous log file handler (see init_logger)
+log_listener: Optional[QueueListener] = None
+# built downlinks by configuration (see downlinks_key and build_matches)
+downlinks_cache: Dict[Tuple[Any, Any, bool], List[str]] = {}
 
 
 def import_yaml_config(filepath: str | Path) -> Dict[str, Any]:
@@ -38,6 +91,7 @@ def init_logger() -> Logger:
         Logger: Customized logger instance.
     """
     global config
+    global log_listener
     log: Logger = getLogger(name=pathfx.basename(__file__).rsplit(".", 1)[0])
     log.setLevel(level=DEBUG)
     # define and register file handler
@@ -55,7 +109,19 @@ def init_logger() -> Logger:
     file_handler.setFormatter(
         fmt=Formatter(fmt=config["logging"]["fileHandler"]["formatter"])
     )
-    log.addHandler(hdlr=file_handler)
+    if config["logging"]["fileHandler"].get("asynchronous", False):
+        # write the log file in a background thread, so disk I/O doesn't
+        # block the main loop (pending records are written at exit)
+        log_listener = QueueListener(
+            Queue(), file_handler, respect_handler_level=True
+        )
+        queue_handler = QueueHandler(log_listener.queue)
+        queue_handler.setLevel(level=file_handler.level)
+        log.addHandler(hdlr=queue_handler)
+        log_listener.start()
+        register_atexit(log_listener.stop)
+    else:
+        log.addHandler(hdlr=file_handler)
     log.debug(f"Initialized logger: '{log}'")
     log.debug(f"Initialized logging file handler: {file_handler}")
     # define and register stream handler for stderr or stdout
@@ -91,11 +157,31 @@ def init_logger() -> Logger:
             f"({config['logging']['streamHandler']['console']}): "
             f"{stream_handler}"
         )
+    # records below all handler levels aren't built at all (lazy debug)
+    log.setLevel(level=min(handler.level for handler in log.handlers))
     log.debug(f"Logger setup done.")
 
     return log
 
 
+def debug_sampled(n: int) -> bool:
+    """Check if the debug details of the n-th device should be logged, that
+    is debug level is written anywhere and n is a multiple of
+    logging:debugSampling (every device by default).
+
+    Args:
+        n (int): Number of the device (position in the processed chunk).
+
+    Returns:
+        bool: True if the debug details of the device should be logged.
+    """
+    global config
+    global log
+    every = max(int(config["logging"].get("debugSampling", 1) or 1), 1)
+    return n % every == 0 and log.isEnabledFor(DEBUG)
+
+
+@metrics.timed()
 def import_xlsx_tables(
     filepath: str = "./conf-table.xlsx",
     sheet1: str = "Conf-Table",
@@ -145,24 +231,61 @@ def import_xlsx_tables(
     return df1, df2
 
 
-def import_xlsx_specs(filepath: str = "./template.xlsx") -> DataFrame:
-    """Import and pre-process input specifications / params.
+def import_cached_tables(
+    filepath: str = "./conf-table.xlsx",
+    sheet1: str = "Conf-Table",
+    sheet2: str = "P-T-Table",
+    cachepath: Optional[str] = None,
+) -> Tuple[DataFrame, DataFrame]:
+    """Import decision params and P-T-Table from binary cache if valid,
+    otherwise import the xlsx workbook and (re-)build the cache.
 
     Args:
-        filepath (str, optional): Absolute or relative filepath.
-            Defaults to "./template.xlsx".
+        filepath (str, optional): Absolute or relative filepath to xlsx file.
+            Defaults to "./conf-table.xlsx".
+        sheet1 (str, optional): Decision params table sheet name.
+            Defaults to "Conf-Table".
+        sheet2 (str, optional): Pressure-Temperature-Table sheet name.
+            Defaults to "P-T-Table".
+        cachepath (Optional[str], optional): Absolute or relative filepath to
+            binary cache file. Defaults to None (cache disabled).
 
     Returns:
-        DataFrame: pandas.DataFrame
+        Tuple[DataFrame, DataFrame]: Both sheets as pandas.DataFrame's.
+    """
+    global log
+    sheets = [sheet1.strip(), sheet2.strip()]
+    if cachepath is None:
+        return import_xlsx_tables(filepath, sheet1, sheet2)
+    try:
+        tables = read_tables_cache(cachepath, filepath.strip(), sheets)
+    except Exception as err:
+        log.warning(f"Couldn't read look-up tables cache, cause: {err}")
+        tables = None
+    if tables is not None:
+        log.debug(f"Imported look-up tables from cache '{cachepath}'.")
+        return tables
+    tables = import_xlsx_tables(filepath, sheet1, sheet2)
+    try:
+        write_tables_cache(cachepath, filepath.strip(), sheets, tables)
+    except Exception as err:
+        log.warning(f"Couldn't write look-up tables cache, cause: {err}")
+    else:
+        log.debug(f"Rebuilt look-up tables cache '{cachepath}'.")
+    return tables
+
+
+def normalize_spec_columns(columns: List[str]) -> Tuple[List[str], List[str]]:
+    """Normalize input specifications column names.
+
+    Args:
+        columns (List[str]): Raw column names (table header).
+
+    Returns:
+        Tuple[List[str], List[str]]: Normalized names of all expected and
+            optional columns and raw names of all unexpected columns.
     """
     global log
-    global config
-    df: DataFrame = read_excel(
-        filepath.strip(),
-        skiprows=config["input"]["skiprows"],
-        index_col=None,
-        engine="openpyxl",
-    )
     expected_columns = [
         "deveui",
         "server",
@@ -180,7 +303,7 @@ def import_xlsx_specs(filepath: str = "./template.xlsx") -> DataFrame:
     )
     _columns: List[str] = []
     unexpected_columns: List[str] = []
-    for col in df.columns:
+    for col in columns:
         _col = col.strip().replace(" ", "-").lower()
         _col = pattern.sub("", _col)
         _col = _col.strip("-")
@@ -191,12 +314,211 @@ def import_xlsx_specs(filepath: str = "./template.xlsx") -> DataFrame:
         else:
             log.debug(f"Got unexpected column: {col}")
             unexpected_columns.append(col)
+    # todo: check mandantory columns based on configured server in config.yaml
+    return _columns, unexpected_columns
+
+
+@metrics.timed()
+def import_xlsx_specs(filepath: str = "./template.xlsx") -> DataFrame:
+    """Import and pre-process input specifications / params.
+
+    Args:
+        filepath (str, optional): Absolute or relative filepath.
+            Defaults to "./template.xlsx".
+
+    Returns:
+        DataFrame: pandas.DataFrame
+    """
+    global config
+    df: DataFrame = read_excel(
+        filepath.strip(),
+        skiprows=config["input"]["skiprows"],
+        index_col=None,
+        engine="openpyxl",
+    )
+    _columns, unexpected_columns = normalize_spec_columns(df.columns)
+    df.drop(unexpected_columns, axis=1, inplace=True)
+    df.dropna(inplace=True)
+    df.columns = _columns
+    return df
+
+
+def iter_xlsx_specs(
+    filepath: str = "./template.xlsx", chunksize: int = 10000
+) -> Iterator[DataFrame]:
+    """Stream and pre-process input specifications / params in chunks.
+
+    Uses openpyxl's read-only mode, so memory usage only depends on the
+    chunk size and not on the number of rows in the workbook.
+
+    Args:
+        filepath (str, optional): Absolute or relative filepath.
+            Defaults to "./template.xlsx".
+        chunksize (int, optional): Max number of rows per chunk.
+            Defaults to 10000.
+
+    Yields:
+        Iterator[DataFrame]: Pre-processed chunks as pandas.DataFrame's
+            (index continues across chunks like in `import_xlsx_specs`).
+    """
+    global config
+    workbook = load_workbook(filepath.strip(), read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(
+            min_row=config["input"]["skiprows"] + 1, values_only=True
+        )
+        header = next(rows, None)
+        if header is None:
+            raise ValueError(f"Missing table header in '{filepath}'.")
+        columns = [
+            f"Unnamed: {i}" if col is None else str(col)
+            for i, col in enumerate(header)
+        ]
+        # normalize header once, then only keep the expected columns
+        _columns, unexpected_columns = normalize_spec_columns(columns)
+        keep = [
+            i for i, col in enumerate(columns) if col not in unexpected_columns
+        ]
+        offset, chunk = 0, []
+        for row in rows:
+            chunk.append([row[i] if i < len(row) else None for i in keep])
+            if len(chunk) >= chunksize:
+                yield _parse_specs_chunk(chunk, _columns, offset)
+                offset, chunk = offset + len(chunk), []
+        if chunk:
+            yield _parse_specs_chunk(chunk, _columns, offset)
+    finally:
+        workbook.close()
+
+
+def _parse_specs_chunk(
+    chunk: List[List[Any]], columns: List[str], offset: int
+) -> DataFrame:
+    """Parse raw cell values like `read_excel` (dtypes and NaN values).
+
+    Args:
+        chunk (List[List[Any]]): Raw cell values of the kept columns.
+        columns (List[str]): Normalized column names.
+        offset (int): Row number of the first row in the chunk.
+
+    Returns:
+        DataFrame: Pre-processed chunk as pandas.DataFrame.
+    """
+    df: DataFrame = TextParser([columns] + chunk, header=0).read()
+    df.index = RangeIndex(offset, offset + len(df))
+    df.dropna(inplace=True)
+    return df
+
+
+def iter_csv_specs(
+    filepath: str, chunksize: Optional[int] = None
+) -> Iterator[DataFrame]:
+    """Import and pre-process input specifications / params from csv file.
+
+    Args:
+        filepath (str): Absolute or relative filepath.
+        chunksize (Optional[int], optional): Max number of rows per chunk.
+            Defaults to None (single chunk).
+
+    Yields:
+        Iterator[DataFrame]: Pre-processed chunks as pandas.DataFrame's.
+    """
+    global config
+    delimiter = config["input"].get("delimiter", ",")
+    columns = read_csv(filepath.strip(), sep=delimiter, nrows=0).columns
+    _columns, unexpected_columns = normalize_spec_columns(columns)
+    usecols = [col for col in columns if col not in unexpected_columns]
+    chunks = read_csv(
+        filepath.strip(),
+        sep=delimiter,
+        usecols=usecols,
+        chunksize=chunksize,
+    )
+    for chunk in [chunks] if chunksize is None else chunks:
+        chunk.columns = _columns
+        chunk.dropna(inplace=True)
+        yield chunk
+
+
+def iter_parquet_specs(
+    filepath: str, chunksize: Optional[int] = None
+) -> Iterator[DataFrame]:
+    """Import and pre-process input specifications / params from parquet
+    file. Only the expected and optional columns are read (projection).
+
+    NOTE: Requires the optional pyarrow package.
+
+    Args:
+        filepath (str): Absolute or relative filepath.
+        chunksize (Optional[int], optional): Max number of rows per chunk.
+            Defaults to None (single chunk).
+
+    Yields:
+        Iterator[DataFrame]: Pre-processed chunks as pandas.DataFrame's.
+    """
+    try:
+        from pyarrow.parquet import ParquetFile
+    except ImportError as err:
+        raise ImportError(
+            "Reading parquet input files requires the pyarrow package: "
+            "python -m pip install pyarrow"
+        ) from err
+    parquet_file = ParquetFile(filepath.strip())
+    columns = parquet_file.schema_arrow.names
+    _columns, unexpected_columns = normalize_spec_columns(columns)
+    usecols = [col for col in columns if col not in unexpected_columns]
+    if chunksize is None:
+        batches = [parquet_file.read(columns=usecols)]
     else:
-        df.drop(unexpected_columns, axis=1, inplace=True)
-        df.dropna(inplace=True)
-        df.columns = _columns
-        # todo: check mandantory columns based on configured server in config.yaml
-        return df
+        batches = parquet_file.iter_batches(
+            batch_size=chunksize, columns=usecols
+        )
+    offset = 0
+    for batch in batches:
+        chunk: DataFrame = batch.to_pandas()
+        chunk.index = RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        chunk.columns = _columns
+        chunk.dropna(inplace=True)
+        yield chunk
+
+
+def import_specs(
+    filepath: str = "./template.xlsx",
+    fmt: Optional[str] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[DataFrame]:
+    """Import and pre-process input specifications / params (dispatcher).
+
+    Args:
+        filepath (str, optional): Absolute or relative filepath.
+            Defaults to "./template.xlsx".
+        fmt (Optional[str], optional): Input format "xlsx", "csv" or
+            "parquet". Defaults to None (detected by file extension).
+        chunksize (Optional[int], optional): Max number of rows per chunk.
+            Defaults to None (single chunk).
+
+    Raises:
+        ValueError: Raised if the input format is not supported.
+
+    Returns:
+        Iterator[DataFrame]: Pre-processed chunks as pandas.DataFrame's.
+    """
+    if fmt is None:
+        fmt = pathfx.splitext(filepath.strip())[1].lstrip(".")
+    fmt = fmt.strip().lower()
+    if fmt in ("xlsx", "xlsm"):
+        if chunksize:
+            return iter_xlsx_specs(filepath, chunksize=chunksize)
+        return iter([import_xlsx_specs(filepath)])
+    elif fmt == "csv":
+        return iter_csv_specs(filepath, chunksize=chunksize)
+    elif fmt in ("parquet", "pq"):
+        return iter_parquet_specs(filepath, chunksize=chunksize)
+    raise ValueError(
+        f"Unsupported input format '{fmt}', must be 'xlsx', 'csv' or "
+        "'parquet'."
+    )
 
 
 def tohex(value: int, zpad: Optional[int] = None) -> str:
@@ -228,11 +550,14 @@ def tohex(value: int, zpad: Optional[int] = None) -> str:
     return f"{value:0{zpad}x}"
 
 
-def build_downlinks(row: Series, pressure: int | float, dn: int) -> List[str]:
+@metrics.timed()
+def build_downlinks(
+    row: ConfRecord, pressure: int | float, dn: int
+) -> List[str]:
     """Build ordered downlink list for MSB configuration.
 
     Args:
-        row (Series): Matched parameter row.
+        row (ConfRecord): Matched parameter row.
         pressure (int | float): Corresponding differential pressure.
         dn (int): Nominal pipe size.
 
@@ -246,67 +571,711 @@ def build_downlinks(row: Series, pressure: int | float, dn: int) -> List[str]:
     """
     global log
     global config
-    global pt_table
+    global pt_lookup
     downlinks = []
 
     # set the minimal uplink frequency to speed-up the configuration process
     downlinks.append(tohex(0x01000000 | 149, 8))  # math.ceil(1.4828 / 0.01)
 
     # set the steam-trap-type
-    stidx = SteamTrapTypes.get_member_by_description(
-        row["steam-trap-type"]
-    ).value  # steam-trap-type index
+    stidx = (
+        row.steam_trap_type.value
+        if isinstance(row.steam_trap_type, SteamTrapTypes)
+        else SteamTrapTypes.get_member_by_description(
+            row.steam_trap_type
+        ).value
+    )  # steam-trap-type index
     downlinks.append(f"0a5{stidx}")
 
     # set the saturated steam temperature
-    pt_idx = (pt_table["p-bar"] - pressure).abs().idxmin()
-    P, T = pt_table.loc[pt_idx, "p-bar"], pt_table.loc[pt_idx, "t-celsius"]
+    P, T = pt_lookup.lookup(pressure)
     downlinks.append(f"82{tohex(T, 2)}")
 
     # set noise thresholds
-    downlinks.append(f"830{stidx}00{tohex(row['tv'], 2)}")  # TV (noise)
-    downlinks.append(f"830{stidx}01{tohex(row['lv'], 2)}")  # LV (noise)
+    downlinks.append(f"830{stidx}00{tohex(row.tv, 2)}")  # TV (noise)
+    downlinks.append(f"830{stidx}01{tohex(row.lv, 2)}")  # LV (noise)
 
     # set steam-loss thresholds and corresponding steam-loss values
-    downlinks.append(f"8d0{stidx}00{tohex(row['slth0'], 2)}".lower())  # SLTh0
-    downlinks.append(
-        f"8d0{stidx}01{tohex(row['slval0'], 2)}".lower()
-    )  # SLVal0
-    downlinks.append(f"8d0{stidx}02{tohex(row['slth1'], 2)}")  # SLTh1
+    downlinks.append(f"8d0{stidx}00{tohex(row.slth0, 2)}".lower())  # SLTh0
+    downlinks.append(f"8d0{stidx}01{tohex(row.slval0, 2)}".lower())  # SLVal0
+    downlinks.append(f"8d0{stidx}02{tohex(row.slth1, 2)}")  # SLTh1
     c1 = (
         2 if stidx == SteamTrapTypes.UNA.value and dn >= 40 else 1
     )  # correction 1
-    slval1 = row["slval1"] * c1
+    slval1 = row.slval1 * c1
     slval1 = 255 if slval1 > 255 else slval1
     downlinks.append(f"8d0{stidx}03{tohex(slval1, 2)}")  # SLVal1
-    downlinks.append(f"8d0{stidx}04{tohex(row['slth2'], 2)}")  # SLTh2
+    downlinks.append(f"8d0{stidx}04{tohex(row.slth2, 2)}")  # SLTh2
     c2 = (
         4 if stidx == SteamTrapTypes.UNA.value and dn >= 40 else 1
     )  # correction 2
-    slval2 = row["slval2"] * c2
+    slval2 = row.slval2 * c2
     slval2 = 255 if slval2 > 255 else slval2
     downlinks.append(f"8d0{stidx}05{tohex(slval2, 2)}")  # SLVal2
 
     # set counters thresholds
-    warn_cnt_th_def = (
-        row["defective-warning"] if "defective-warning" in row else 360
-    )
-    downlinks.append(f"8402{tohex(warn_cnt_th_def, 4)}")  # WarnCntThDef
-    err_cnt_th_def = (
-        row["defective-alarm"] if "defective-alarm" in row else 720
-    )
-    downlinks.append(f"8502{tohex(err_cnt_th_def, 4)}")  # ErrCntThDef
+    downlinks.append(f"8402{tohex(row.defective_warning, 4)}")  # WarnCntThDef
+    downlinks.append(f"8502{tohex(row.defective_alarm, 4)}")  # ErrCntThDef
 
     # reset counters and set uplink frequency back to desired sample period
     if config["downlinks"]["resetErrorCounters"]:
         downlinks.append(f"04fc")  # counters reset
-    twkup = row["twkup"] if "twkup" in row else 3600
-    downlinks.append(tohex(0x01000000 | twkup, 8))
+    downlinks.append(tohex(0x01000000 | row.twkup, 8))
 
     return downlinks
 
 
+def _tohex_column(values: ndarray, zpad: int) -> ndarray:
+    """Convert an integer column to (zero-padded) hex-strings, see `tohex`.
+
+    Args:
+        values (ndarray): Integer values to convert.
+        zpad (int): Hex-string length.
+
+    Returns:
+        ndarray: Hex-strings as numpy object array.
+    """
+    if (
+        zpad == 2
+        and values.dtype.kind in "iu"
+        and values.size
+        and values.min() >= 0
+        and values.max() <= 0xFF
+    ):
+        return _HEX_BYTES[values]
+    return array(
+        [tohex(value, zpad) for value in values.tolist()], dtype=object
+    )
+
+
+@metrics.timed()
+def build_downlinks_batch(
+    df: DataFrame,
+    pressure: str = "differential-pressure",
+    dn: str = "dn",
+) -> Series:
+    """Build ordered downlink lists for many MSB configurations at once.
+
+    Column-wise (vectorized) counterpart of `build_downlinks`, producing the
+    same hex-strings for each row of the merged device x parameter table.
+
+    Args:
+        df (DataFrame): Matched parameter rows merged with the corresponding
+            device pressure and nominal pipe size columns.
+        pressure (str, optional): Differential pressure column name.
+            Defaults to "differential-pressure".
+        dn (str, optional): Nominal pipe size column name. Defaults to "dn".
+
+    Returns:
+        Series: Lists with hex-strings of hex-digits representing LoRa
+            downlinks for device configuration (same index as `df`).
+    """
+    global config
+    global pt_lookup
+    n = len(df)
+    if n == 0:
+        return Series([], index=df.index, dtype=object)
+
+    def constant(value: str) -> ndarray:
+        return full(n, value, dtype=object)
+
+    def column(name: str, default: int, zpad: int, mask: int = 0) -> ndarray:
+        # optional columns fall back to a constant default (see scalar path)
+        if name not in df.columns:
+            return constant(tohex(mask | default, zpad))
+        return _tohex_column(mask | df[name].to_numpy(), zpad)
+
+    downlinks: List[ndarray] = []
+
+    # set the minimal uplink frequency to speed-up the configuration process
+    downlinks.append(constant(tohex(0x01000000 | 149, 8)))
+
+    # set the steam-trap-type
+    codes, descriptions = factorize(
+        df["steam-trap-type"], use_na_sentinel=False
+    )
+    values = [
+        SteamTrapTypes.get_member_by_description(description).value
+        for description in descriptions
+    ]
+    stidx = array(values, dtype=int64)[codes]  # steam-trap-type index
+    st = array([str(value) for value in values], dtype=object)[codes]
+    downlinks.append("0a5" + st)
+
+    # set the saturated steam temperature
+    P, T = pt_lookup.lookup_many(df[pressure].to_numpy(dtype=float64))
+    downlinks.append("82" + _tohex_column(T, 2))
+
+    # set noise thresholds
+    downlinks.append("830" + st + "00" + _tohex_column(df["tv"].to_numpy(), 2))
+    downlinks.append("830" + st + "01" + _tohex_column(df["lv"].to_numpy(), 2))
+
+    # set steam-loss thresholds and corresponding steam-loss values
+    una = (stidx == SteamTrapTypes.UNA.value) & (df[dn].to_numpy() >= 40)
+    c1 = where(una, 2, 1)  # correction 1
+    slval1 = df["slval1"].to_numpy() * c1
+    slval1 = where(slval1 > 255, 255, slval1)
+    c2 = where(una, 4, 1)  # correction 2
+    slval2 = df["slval2"].to_numpy() * c2
+    slval2 = where(slval2 > 255, 255, slval2)
+    for i, values in enumerate(
+        [
+            df["slth0"].to_numpy(),  # SLTh0
+            df["slval0"].to_numpy(),  # SLVal0
+            df["slth1"].to_numpy(),  # SLTh1
+            slval1,  # SLVal1
+            df["slth2"].to_numpy(),  # SLTh2
+            slval2,  # SLVal2
+        ]
+    ):
+        downlinks.append("8d0" + st + f"0{i}" + _tohex_column(values, 2))
+
+    # set counters thresholds
+    downlinks.append("8402" + column("defective-warning", 360, 4))
+    downlinks.append("8502" + column("defective-alarm", 720, 4))
+
+    # reset counters and set uplink frequency back to desired sample period
+    if config["downlinks"]["resetErrorCounters"]:
+        downlinks.append(constant("04fc"))  # counters reset
+    downlinks.append(column("twkup", 3600, 8, mask=0x01000000))
+
+    return Series(list(map(list, zip(*downlinks))), index=df.index)
+
+
+@metrics.timed()
+def match_specs(df: DataFrame) -> List[Tuple[DeviceRecord, Any]]:
+    """Match device specifications against the decision params index.
+
+    Args:
+        df (DataFrame): Pre-processed input specifications (devices).
+
+    Returns:
+        List[Tuple[DeviceRecord, Any]]: Matched device records together with
+            the index label of the corresponding decision params row.
+    """
+    global log
+    global conf_index
+    global conf_rows
+    matches: List[Tuple[DeviceRecord, Any]] = []
+    # match params of a device record (same order as the index keys)
+    key_of = attrgetter(*map(match_key, conf_index.keys))
+    single = len(conf_index.keys) == 1  # attrgetter returns no tuple
+    # iteration loop over all configuration rows (devices)
+    log.debug("Entering main-loop.")
+    for n, row in enumerate(device_records(df)):
+        sampled = debug_sampled(n)
+        if sampled:
+            log.debug(
+                "Processing row with index:%s and DevEUI:%s",
+                row.label,
+                row.deveui,
+            )
+        # look-up pre-built decision params index (categorical match params
+        # and closed pressure interval [p-min, p-max])
+        pressure = row.differential_pressure
+        key = (key_of(row),) if single else key_of(row)
+        _idx = conf_index.lookup(key, pressure)
+        if _idx is None:
+            log.warning(
+                "No parameter full-match for server:%s, device:%s.",
+                row.server,
+                row.deveui,
+            )
+            metrics.count("unmatched_devices")
+            continue
+        if sampled:  # log matched params
+            _row = conf_rows[_idx]
+            params = {"_idx": _idx}
+            for param in conf_index.keys:
+                params[param] = getattr(row, match_key(param))
+            params["pressure"] = pressure
+            params["p-min"] = _row.p_min
+            params["p-max"] = _row.p_max
+            log.debug("Matched params: %s", dumps(params))
+        matches.append((row, _idx))
+    else:
+        log.debug(f"Finished main-loop without breaks.")
+    metrics.count("matched_devices", len(matches))
+
+    return matches
+
+
+def downlinks_keys(
+    idxs: List[Any], pressures: List[Any], dns: List[Any]
+) -> List[Tuple[Any, Any, bool]]:
+    """Keys of the configurations devices are built from.
+
+    Devices with the same matched decision params row (steam-trap-type,
+    noise and steam-loss thresholds, counter thresholds and twkup), the same
+    nearest P-T-Table pressure (saturated steam temperature) and the same
+    nominal pipe size class (UNA corrections, DN >= 40) get identical
+    downlinks.
+
+    Args:
+        idxs (List[Any]): Index labels of the matched decision params rows.
+        pressures (List[Any]): Corresponding differential pressures.
+        dns (List[Any]): Nominal pipe sizes.
+
+    Returns:
+        List[Tuple[Any, Any, bool]]: Configuration keys.
+    """
+    global pt_lookup
+    P, T = pt_lookup.lookup_many(array(pressures, dtype=float64))
+    return list(
+        zip(idxs, P.tolist(), (array(dns, dtype=float64) >= 40).tolist())
+    )
+
+
+def _build_matches(
+    idxs: List[Any], pressures: List[Any], dns: List[Any]
+) -> List[List[str]]:
+    global config
+    global msb_config_params
+    global conf_rows
+    if not idxs:
+        return []
+    if config["downlinks"].get("vectorized", True):
+        # merged device x parameter table, counter thresholds and twkup are
+        # taken from the decision params row like in the row-wise build
+        merged = msb_config_params.loc[idxs]
+        merged = merged.assign(
+            **{"differential-pressure": pressures, "dn": dns}
+        )
+        return build_downlinks_batch(merged).tolist()
+    return [
+        build_downlinks(
+            conf_rows[_idx],  # loop-up table
+            pressure,
+            dn,  # user defined input
+        )
+        for _idx, pressure, dn in zip(idxs, pressures, dns)
+    ]
+
+
+@metrics.timed()
+def build_matches(matches: List[Tuple[DeviceRecord, Any]]) -> List[List[str]]:
+    """Build downlinks for all matched devices.
+
+    With `downlinks.memoize` each configuration (see `downlinks_keys`) is
+    built once per process, devices of the same configuration share the
+    (read-only) downlink list.
+
+    Args:
+        matches (List[Tuple[DeviceRecord, Any]]): Matched device records
+            together with the index label of the corresponding decision
+            params row.
+
+    Returns:
+        List[List[str]]: Ordered downlink lists (same order as `matches`).
+    """
+    global log
+    global config
+    global downlinks_cache
+    idxs = [_idx for _, _idx in matches]
+    pressures = [row.differential_pressure for row, _ in matches]
+    dns = [row.dn for row, _ in matches]
+    if not matches or not config["downlinks"].get("memoize", True):
+        built = _build_matches(idxs, pressures, dns)
+        log.debug(f"Built downlinks for {len(built)} devices.")
+        return built
+
+    keys = downlinks_keys(idxs, pressures, dns)
+    missing: Dict[Tuple[Any, Any, bool], int] = {}  # first device position
+    for i, key in enumerate(keys):
+        if key not in downlinks_cache and key not in missing:
+            missing[key] = i
+    for key, downlinks in zip(
+        missing,
+        _build_matches(
+            [idxs[i] for i in missing.values()],
+            [pressures[i] for i in missing.values()],
+            [dns[i] for i in missing.values()],
+        ),
+    ):
+        downlinks_cache[key] = downlinks
+    built = [downlinks_cache[key] for key in keys]
+    metrics.count("memoized_downlinks", len(built) - len(missing))
+    log.debug(
+        f"Built downlinks for {len(built)} devices "
+        f"({len(missing)} new configurations)."
+    )
+
+    return built
+
+
+FINGERPRINT_VERSION = 3  # increase if the downlinks generation changes
+
+
+def fingerprint_device(row: DeviceRecord, _row: ConfRecord) -> str:
+    """Fingerprint the inputs of a single device's downlinks generation.
+
+    Args:
+        row (DeviceRecord): Device specifications (input row).
+        _row (ConfRecord): Matched decision params row.
+
+    Returns:
+        str: sha1 hex-digest of the device's input and matched params.
+    """
+    # without the index labels, which shift if input rows are added/removed
+    content = dumps([row[1:], _row[1:]], default=str)
+    return sha1(content.encode()).hexdigest()
+
+
+def fingerprint_run(tables: List[DataFrame]) -> str:
+    """Fingerprint the inputs shared by all devices (downlinks and server
+    configuration and look-up tables). If this changes, all devices have to
+    be rebuilt.
+
+    Args:
+        tables (List[DataFrame]): Look-up tables.
+
+    Returns:
+        str: sha1 hex-digest of the shared inputs.
+    """
+    global config
+    digest = sha1(str(FINGERPRINT_VERSION).encode())
+    digest.update(
+        dumps([config["downlinks"], config["server"]], sort_keys=True).encode()
+    )
+    for table in tables:
+        digest.update(table.to_csv().encode())
+    return digest.hexdigest()
+
+
+def import_fingerprints(
+    filepath: str, output: str, run: str
+) -> Dict[Any, Tuple[str, List[str]]]:
+    """Import fingerprints and downlinks of the previous run.
+
+    Args:
+        filepath (str): Absolute or relative filepath to fingerprints file.
+        output (str): Absolute or relative filepath to previous output.
+        run (str): Fingerprint of the shared inputs of the current run.
+
+    Returns:
+        Dict[Any, Tuple[str, List[str]]]: Fingerprint and downlinks by
+            DevEUI. Empty if there is no previous run with the same shared
+            inputs (full regeneration).
+    """
+    global log
+    if not (pathfx.isfile(filepath) and pathfx.isfile(output)):
+        log.info("No previous run found, regenerating all devices.")
+        return {}
+    with open(file=filepath, mode="r") as json_file:
+        fingerprints = json_load(fp=json_file)
+    if fingerprints["run"] != run:
+        log.info("Configuration or look-up tables changed since last run.")
+        return {}
+    previous: Dict[Any, Tuple[str, List[str]]] = {}
+    for server in iter_servers(output):
+        for dev_eui, downlinks in server["downlinks"].items():
+            if dev_eui in fingerprints["devices"]:
+                previous[dev_eui] = (
+                    fingerprints["devices"][dev_eui],
+                    downlinks,
+                )
+    return previous
+
+
+def import_state(filepath: str) -> Dict[Any, List[str]]:
+    """Import the configuration applied last to each device.
+
+    Args:
+        filepath (str): Absolute or relative filepath to downlinks file (json
+            or ndjson) with the full downlinks applied last.
+
+    Returns:
+        Dict[Any, List[str]]: Full downlinks by DevEUI.
+    """
+    state: Dict[Any, List[str]] = {}
+    for server in iter_servers(filepath):
+        state.update(server["downlinks"])
+    return state
+
+
+def process_specs(
+    df: DataFrame,
+) -> Tuple[List[Tuple[Any, Any]], List[List[str]], List[Tuple[str, bool]]]:
+    """Match and build downlinks for a chunk of device specifications.
+
+    In incremental mode only devices with changed fingerprints are built,
+    the downlinks of all other devices are taken from the previous run.
+
+    Args:
+        df (DataFrame): Pre-processed input specifications (devices).
+
+    Returns:
+        Tuple[List[Tuple[Any, Any]], List[List[str]], List[Tuple[str, bool]]]:
+            Server address and DevEUI of all matched devices, their ordered
+            downlink lists and (incremental mode only, otherwise empty)
+            their fingerprints and whether they have changed.
+    """
+    global log
+    global conf_rows
+    global previous
+    matches = match_specs(df)
+    devices = [(row.server, row.deveui) for row, _ in matches]
+    if previous is None:
+        return devices, build_matches(matches), []
+    states: List[Tuple[str, bool]] = []
+    for (_, dev_eui), (row, _idx) in zip(devices, matches):
+        fingerprint = fingerprint_device(row, conf_rows[_idx])
+        changed = previous.get(dev_eui, (None,))[0] != fingerprint
+        states.append((fingerprint, changed))
+    rebuilt = iter(
+        build_matches([match for match, (_, ch) in zip(matches, states) if ch])
+    )
+    built = [
+        next(rebuilt) if changed else previous[dev_eui][1]
+        for (_, dev_eui), (_, changed) in zip(devices, states)
+    ]
+    log.debug(
+        f"Reused downlinks of {sum(not ch for _, ch in states)} unchanged "
+        "devices."
+    )
+    return devices, built, states
+
+
+def process_specs_worker(
+    df: DataFrame,
+) -> Tuple[
+    List[Tuple[Any, Any]],
+    List[List[str]],
+    List[Tuple[str, bool]],
+    Dict[str, Any],
+]:
+    """Process a chunk in a worker process (see process_specs), the timing
+    metrics of the worker are passed along to be merged by the main process.
+
+    Args:
+        df (DataFrame): Pre-processed input specifications (devices).
+
+    Returns:
+        Tuple[..., Dict[str, Any]]: Results of process_specs and the
+            drained metrics records of the worker.
+    """
+    global metrics
+    return (*process_specs(df), metrics.drain())
+
+
+def dump_profile(profiler: Profile, filepath: str) -> None:
+    """Stop the profiler and save its stats (see pstats.Stats).
+
+    Args:
+        profiler (Profile): Enabled profiler of the run.
+        filepath (str): Absolute or relative filepath to stats file.
+    """
+    profiler.disable()
+    profiler.dump_stats(filepath)
+    print(f"Saved profile stats as '{filepath}'.", file=stderr)
+
+
+def init_worker(
+    _config: Dict[str, Any],
+    _msb_config_params: DataFrame,
+    _pt_table: DataFrame,
+    match_params: List[str],
+    _previous: Optional[Dict[Any, Tuple[str, List[str]]]],
+) -> None:
+    """Initialize the globals of a generation worker process once, so the
+    look-up tables don't need to be shipped with each chunk.
+
+    Args:
+        _config (Dict[str, Any]): Imported yaml configuration.
+        _msb_config_params (DataFrame): Decision params table.
+        _pt_table (DataFrame): Pressure-Temperature-Table.
+        match_params (List[str]): Categorical match params.
+        _previous (Optional[Dict[Any, Tuple[str, List[str]]]]): Fingerprints
+            and downlinks of the previous run (incremental mode only).
+    """
+    global config
+    global log
+    global msb_config_params
+    global pt_lookup
+    global conf_index
+    global conf_rows
+    global previous
+    global metrics
+    global log_listener
+    global downlinks_cache
+    config = _config
+    # forked workers inherit the configured logger, spawned ones log
+    # warnings and errors to stderr
+    log = getLogger(name=pathfx.basename(__file__).rsplit(".", 1)[0])
+    if log_listener is not None:  # forked workers have no listener thread
+        for handler in list(log.handlers):
+            if isinstance(handler, QueueHandler):
+                log.removeHandler(handler)
+        for handler in log_listener.handlers:
+            log.addHandler(handler)
+        log_listener = None
+    msb_config_params = _msb_config_params
+    pt_lookup = PTTable(_pt_table)
+    conf_index = ConfTableIndex(
+        resolve_types(msb_config_params), keys=match_params
+    )
+    conf_rows = conf_records(msb_config_params)
+    previous = _previous
+    downlinks_cache = {}
+    metrics.drain()  # drop records inherited from the main process (fork)
+
+
+def split_specs(df: DataFrame, n: int) -> List[DataFrame]:
+    """Partition device specifications into (at most) n ordered chunks.
+
+    Args:
+        df (DataFrame): Pre-processed input specifications (devices).
+        n (int): Number of chunks.
+
+    Returns:
+        List[DataFrame]: Consecutive chunks in input order.
+    """
+    size = max(-(-len(df) // n), 1)  # ceil
+    return [df.iloc[i : i + size] for i in range(0, len(df), size)]
+
+
+def parse_server_address(address: str) -> Tuple[Optional[str], str, int]:
+    """Parse server address string into protocol, host and port.
+
+    Supported formats: "host", "host:port", "protocol://host" and
+    "protocol://host:port". Without port, https uses 443, http 80 and
+    addresses without protocol the local server port (UG6x: 8080) or 443.
+
+    Args:
+        address (str): Server address as specified in the input table.
+
+    Raises:
+        ValueError: Raised if the address contains too many elements or the
+            port is not an integer.
+
+    Returns:
+        Tuple[Optional[str], str, int]: Protocol (None if not specified),
+            host and port.
+    """
+    global config
+    address = address.strip()
+    protocol: Optional[str] = None
+    if "://" in address:
+        protocol, address = address.split("://", 1)
+        protocol = protocol.lower()
+    address = address.rstrip("/")
+    if address.count(":") > 1 or not address:
+        raise ValueError(
+            f"Server address contains to many elements: '{address}'"
+        )
+    if ":" in address:
+        host, port = address.split(":")
+        return protocol, host, int(port)
+    elif protocol == "https":
+        return protocol, address, 443
+    elif protocol == "http":
+        return protocol, address, 80
+    # ! add other local server ports here -------------------------------------
+    elif config["server"].lower() == "ug6x":
+        return protocol, address, 8080
+    # ! -----------------------------------------------------------------------
+    # fallback for non-local / cloud servers
+    return protocol, address, 443
+
+
+def group_by_server(
+    writer: DownlinksWriter,
+    devices: List[Tuple[Any, Any]],
+    built: List[List[str]],
+    registry: Dict[Any, Optional[int]],
+) -> None:
+    """Write built device downlinks to their server json blocks.
+
+    Args:
+        writer (DownlinksWriter): Streamed writer of the output file.
+        devices (List[Tuple[Any, Any]]): Server address and DevEUI of all
+            matched devices.
+        built (List[List[str]]): Ordered downlink lists of the devices,
+            devices without downlinks are skipped.
+        registry (Dict[Any, Optional[int]]): Server numbers of the writer
+            by raw address string and by normalized (protocol, host, port)
+            key (updated in place, reuse it for all chunks).
+    """
+    global log
+    global config
+    for (address, dev_eui), downlinks in zip(devices, built):
+        if not downlinks:  # unchanged device (minimal mode)
+            continue
+        if address in registry:  # raw address has been parsed already
+            server = registry[address]
+        else:
+            try:
+                protocol, host, port = parse_server_address(address)
+            except Exception as err:
+                log.critical(f"Invalid server address, cause: {err}")
+                server = registry[address] = None
+            else:
+                key = (protocol, host.lower(), port)
+                if key not in registry:
+                    log.debug(f"Created new server json block: {address}")
+                    registry[key] = writer.add_server(
+                        {
+                            "address": {
+                                "protocol": protocol,
+                                "host": host,
+                                "port": port,
+                            },
+                            "credentials": {
+                                "username": "apiuser",
+                                "password": "password",
+                            },
+                            "downlinkSettings": {
+                                "fport": config["downlinks"]["fport"],
+                                "confirmed": config["downlinks"]["confirmed"],
+                                "flushQueue": config["downlinks"][
+                                    "flushQueue"
+                                ],
+                            },
+                        }
+                    )
+                server = registry[address] = registry[key]
+        if server is None:
+            log.warning(
+                f"Skipped device:{dev_eui}, cause: invalid server:{address}."
+            )
+            continue
+        writer.add_device(server, dev_eui, downlinks)
+
+
 if __name__ == "__main__":
+    freeze_support()  # required for worker processes of frozen executables
+    # * parse command line arguments * #######################################
+    parser = ArgumentParser(
+        description="Generate MSB configuration downlinks."
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="filepath to configuration yaml file (default: ./config.yaml)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes for matching and building",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="./gen-downlinks.pstats",
+        default=None,
+        help="profile the run (cProfile, main process only) and save the "
+        "stats file (default: ./gen-downlinks.pstats)",
+    )
+    args = parser.parse_args()
+    if args.config:  # resolve before changing the work directory
+        args.config = pathfx.abspath(args.config)
+    if args.profile:  # saved at exit, also if the run fails
+        args.profile = pathfx.abspath(args.profile)
+        profiler = Profile()
+        register_atexit(dump_profile, profiler, args.profile)
+        profiler.enable()
+
     # * fix work directory * ##################################################
     workdir = Path("downlink-generation")
     if not getcwd().endswith(str(workdir)):
@@ -314,7 +1283,8 @@ if __name__ == "__main__":
         # print(f"CWD: {getcwd()}")
 
     # * import global config * ################################################
-    for file in ["./config.yaml", "./config.yml", "./config.example.yaml"]:
+    files = ["./config.yaml", "./config.yml", "./config.example.yaml"]
+    for file in [args.config] if args.config else files:
         if pathfx.isfile(file):
             config = import_yaml_config(filepath=file)
             break
@@ -328,11 +1298,12 @@ if __name__ == "__main__":
 
     # * import look-up tables * ###############################################
     try:
-        msb_config_params, pt_table = import_xlsx_tables(
+        msb_config_params, pt_table = import_cached_tables(
             filepath=config["lookup"]["workbook"],
             sheet1=config["lookup"]["sheet1"],
             sheet2=config["lookup"]["sheet2"],
-        )  # use defaults
+            cachepath=config["lookup"].get("cache"),
+        )
     except Exception as err:
         log.error(
             "Couldn't import xlsx look-up tables "
@@ -340,24 +1311,31 @@ if __name__ == "__main__":
         )
     else:
         log.debug(f"Imported xlsx look-up tables.")
+        pt_lookup = PTTable(pt_table)
         # print(msb_config_params.head())
         # print(pt_table.head())
 
     # * import custom user specified params * #################################
+    filepath = (
+        config["input"]["filepath"]
+        if pathfx.isfile(config["input"]["filepath"])
+        else "./template.xlsx"
+    )
     try:
-        df = import_xlsx_specs(
-            config["input"]["filepath"]
-            if pathfx.isfile(config["input"]["filepath"])
-            else "./template.xlsx"
+        # chunks get imported during generation if chunksize is set
+        specs = import_specs(
+            filepath,
+            fmt=config["input"].get("format"),
+            chunksize=config["input"].get("chunksize"),
         )
     except Exception as err:
         log.error(
-            "Couldn't import user defined msb specifications xlsx-table, "
+            "Couldn't import user defined msb specifications table, "
             f"cause: {err}"
         )
     else:
         log.debug(
-            f"Imported user defined msb specifications xlsx-table."
+            f"Imported user defined msb specifications table."
         ) if pathfx.isfile(config["input"]["filepath"]) else log.warning(
             "Imported './template.xlsx' specifications, cause couldn't find "
             "the specified input file."
@@ -371,144 +1349,218 @@ if __name__ == "__main__":
         "hardware-model",
         "condensate-load",
     ]
+    # index and records with resolved enum members (steam-trap-type and
+    # mounting-type), devices are resolved the same way during matching
+    conf_index = ConfTableIndex(
+        resolve_types(msb_config_params), keys=match_params
+    )
+    conf_rows = conf_records(msb_config_params)
+    log.debug(f"Built decision params index with {len(conf_index)} keys.")
 
-    # * downlinks generation * ################################################
-    dct: Dict[str, List[Dict[str, List[str]]]] = {"server": []}
+    # * import fingerprints of previous run (incremental mode) * #############
+    previous: Optional[Dict[Any, Tuple[str, List[str]]]] = None
+    if config["output"].get("incremental", False):
+        run = fingerprint_run([msb_config_params, pt_table])
+        try:
+            previous = import_fingerprints(
+                config["output"]["fingerprints"],
+                # the output of the minimal mode isn't complete
+                (config.get("minimal") or {}).get("snapshot")
+                or config["output"]["filepath"],
+                run,
+            )
+        except Exception as err:
+            log.warning(
+                f"Couldn't import fingerprints of previous run, cause: {err}"
+            )
+            previous = {}
+        else:
+            log.debug(f"Imported fingerprints of {len(previous)} devices.")
 
-    # iteration loop over all configuration rows (devices)
-    log.debug("Entering main-loop.")
-    for idx, row in df.iterrows():
-        # iteration loop over all pre-defined decision param look-up table
-        log.debug(
-            f"Processing row with index:{idx} and DevEUI:{row['deveui']}"
+    # * import configuration applied last (minimal mode) * ##################
+    state: Optional[Dict[Any, List[str]]] = None
+    if config.get("minimal"):
+        try:
+            state = import_state(config["minimal"]["state"])
+        except FileNotFoundError:
+            log.info("No applied configuration found, emitting all downlinks.")
+            state = {}
+        except Exception as err:
+            log.warning(f"Couldn't import applied configuration, cause: {err}")
+            state = {}
+        else:
+            log.debug(
+                f"Imported applied configuration of {len(state)} devices."
+            )
+
+    # * payload packing of the emitted downlinks (optional) * ################
+    packer: Optional[DownlinksPacker] = None
+    packing = config["downlinks"].get("packing") or {}
+    if packing.get("enabled", False):
+        packer = DownlinksPacker(
+            packing.get("maxPayload")
+            or MAX_PAYLOAD_SIZES[packing.get("dataRate", 0)]
         )
-        for _idx, _row in msb_config_params.iterrows():
-            params = {"_idx": _idx}
-            for param in match_params:
-                if row[param] == _row[param]:  # includes type check
-                    params[param] = row[param]
-                else:
-                    break  # if this is executed once, else will not be entered
-            else:
-                # additional conditions:
-                # this section gets processed if the for-loop of the same level
-                # gets processed without any break
-                pressure = row["differential-pressure"]
-                if pressure >= _row["p-min"] and pressure <= _row["p-max"]:
-                    # log matched params
-                    params["pressure"] = pressure
-                    params["p-min"] = _row["p-min"]
-                    params["p-max"] = _row["p-max"]
-                    log.debug(f"Matched params: {dumps(params)}")
-                    # continue processing
-                    server_index = 0
-                    for server in dct["server"]:
-                        if row["server"] == server["address"]["host"]:
-                            log.debug(
-                                "adding device downlinks to existing server: "
-                                f"{row['server']}"
-                            )
-                            # ... server already listed
-                            dct["server"][server_index]["downlinks"][
-                                row["deveui"]
-                            ] = build_downlinks(
-                                _row,  # loop-up table
-                                pressure,
-                                row["dn"],  # user defined input
-                            )
-                            break  # to bypass for-else block if matched
-                        else:
-                            server_index += 1
-                    else:
-                        server: str = row["server"].strip()
-                        server = row["server"].strip().split(":")
-                        if len(server) == 1:
-                            protocol = None
-                            host = server[0]
-                            # ! add other local server ports here -------------
-                            if config["server"].lower() == "ug6x":
-                                port = 8080
-                            # ! -----------------------------------------------
-                            else:
-                                # fallback for non-local / cloud servers
-                                port = 443
-                        elif len(server) == 2:
-                            if server[0].startswith("https"):
-                                protocol = server[0]
-                                host = server[1][2:]  # remove //...
-                                port = 443
-                            elif server[0].startswith("http"):
-                                protocol = server[0][2:]  # remove //...
-                                host = server[1]
-                                port = 80
-                            else:
-                                protocol = None
-                                host = server[0]
-                                port = server[1]
-                        elif len(server) == 3:
-                            protocol = server[0]
-                            host = server[1][2:]  # remove //...
-                            port = server[2]
-                        else:
-                            log.critical(
-                                "Server address contains to many elements: "
-                                f"{len(server)}, server.split(':'): {server}"
-                            )
-                        log.debug(
-                            f"Created new server json block: {row['server']}"
-                        )
-                        dct["server"].append(
-                            {
-                                "address": {
-                                    "protocol": protocol,
-                                    "host": host,
-                                    "port": port,
-                                },
-                                "credentials": {
-                                    "username": "apiuser",
-                                    "password": "password",
-                                },
-                                "downlinkSettings": {
-                                    "fport": config["downlinks"]["fport"],
-                                    "confirmed": config["downlinks"][
-                                        "confirmed"
-                                    ],
-                                    "flushQueue": config["downlinks"][
-                                        "flushQueue"
-                                    ],
-                                },
-                                "downlinks": {
-                                    row["deveui"]: build_downlinks(
-                                        _row,
-                                        pressure,
-                                        config["downlinks"][
-                                            "resetErrorCounters"
-                                        ],
-                                    )
-                                },
-                            }
-                        )
-                    # break out of looping over decision params
-                    break
-                else:
-                    # level: pressure matching statement
-                    if _idx == len(msb_config_params) - 1:
-                        log.warning(
-                            f"No parameter full-match for "
-                            f"server:{row['server']}, device:{row['deveui']}."
-                        )
+        log.debug(f"Packing commands into {packer.max_size} byte payloads.")
+
+    # * downlinks generation (streamed to the output file) * #################
+    writer = open_downlinks_writer(
+        config["output"]["filepath"],
+        fmt=config["output"].get("format"),
+        indent=config["output"]["indent"],
+        profiles=config["output"].get("profiles", False),
+    )
+    registry: Dict[Any, Optional[int]] = {}  # server blocks
+    delta_writer: Optional[DownlinksWriter] = None  # changed devices only
+    if previous is not None and config["output"].get("delta"):
+        delta_writer = open_downlinks_writer(
+            config["output"]["delta"],
+            fmt=config["output"].get("format"),
+            indent=config["output"]["indent"],
+            profiles=config["output"].get("profiles", False),
+        )
+    delta_registry: Dict[Any, Optional[int]] = {}
+    snapshot_writer: Optional[DownlinksWriter] = None  # full downlinks
+    if state is not None and config["minimal"].get("snapshot"):
+        snapshot_writer = open_downlinks_writer(
+            config["minimal"]["snapshot"],
+            fmt=config["output"].get("format"),
+            indent=config["output"]["indent"],
+            profiles=config["output"].get("profiles", False),
+        )
+    snapshot_registry: Dict[Any, Optional[int]] = {}
+    fingerprints: Dict[Any, str] = {}
+    n_changed = 0
+    n_full = n_minimal = 0  # downlinks (minimal mode)
+    n_unpacked = n_packed = 0  # downlinks (packing)
+
+    start = perf_counter()
+    with (
+        ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=init_worker,
+            initargs=(
+                config,
+                msb_config_params,
+                pt_table,
+                match_params,
+                previous,
+            ),
+        )
+        if args.workers > 1
+        else nullcontext()
+    ) as executor, writer, (
+        delta_writer or nullcontext()
+    ), (
+        snapshot_writer or nullcontext()
+    ):
+        if executor is None:
+            results = map(process_specs, specs)
         else:
-            log.warning(
-                f"No parameter full-match for "
-                f"server:{row['server']}, device:{row['deveui']}."
+            # partition into ordered chunks, executor.map keeps input order
+            log.info(f"Generating downlinks with {args.workers} workers.")
+            results = (
+                result
+                for df in specs
+                for result in executor.map(
+                    process_specs_worker, split_specs(df, args.workers * 4)
+                )
             )
-    else:
-        log.debug(f"Finished main-loop without breaks.")
+        for devices, built, states, *records in results:
+            if records:  # timing metrics of the worker process
+                metrics.merge(records[0])
+            if state is not None:  # only changed parameters
+                if snapshot_writer is not None:
+                    group_by_server(
+                        snapshot_writer, devices, built, snapshot_registry
+                    )
+                n_full += sum(map(len, built))
+                built = [
+                    minimal_downlinks(downlinks, state.get(dev_eui))
+                    for (_, dev_eui), downlinks in zip(devices, built)
+                ]
+                n_minimal += sum(map(len, built))
+                metrics.count("unchanged_devices", built.count([]))
+            if packer is not None:  # fewer, multi-command downlinks
+                n_unpacked += sum(map(len, built))
+                built = list(map(packer.pack, built))
+                n_packed += sum(map(len, built))
+            group_by_server(writer, devices, built, registry)
+            if previous is None:
+                continue
+            changed = [i for i, (_, ch) in enumerate(states) if ch]
+            n_changed += len(changed)
+            if delta_writer is not None:
+                group_by_server(
+                    delta_writer,
+                    [devices[i] for i in changed],
+                    [built[i] for i in changed],
+                    delta_registry,
+                )
+            for (_, dev_eui), (fingerprint, _) in zip(devices, states):
+                fingerprints[dev_eui] = fingerprint
+        metrics.observe("generate_downlinks", perf_counter() - start)
+
+        # * complete the output file(s) * #####################################
+        with metrics.timer("save_downlinks"):
+            writer.close()
+            if delta_writer is not None:
+                delta_writer.close()
+            if snapshot_writer is not None:
+                snapshot_writer.close()
+    log.info(
+        f"Saved {writer.devices} devices of {writer.servers} servers as "
+        f"'{config['output']['filepath']}'."
+    )
 
-    # * save generated downlinks dictionary as json file * ####################
-    with open(file=config["output"]["filepath"], mode="w+") as json_file:
-        json_dump(obj=dct, fp=json_file, indent=config["output"]["indent"])
-        log.info(f"Saved results as '{config['output']['filepath']}'.")
+    if state is not None:
+        log.info(
+            f"Emitted {n_minimal}/{n_full} downlinks of changed parameters "
+            f"compared to '{config['minimal']['state']}'."
+        )
+        if snapshot_writer is not None:
+            log.info(
+                f"Saved full downlinks as '{config['minimal']['snapshot']}', "
+                "use it as applied configuration once transmitted."
+            )
+
+    if packer is not None:
+        log.info(
+            f"Packed {n_unpacked} commands into {n_packed} downlinks "
+            f"(max. {packer.max_size} bytes)."
+        )
+
+    # * save fingerprints and changed devices (incremental mode) * ###########
+    if previous is not None:
+        with open(
+            file=config["output"]["fingerprints"], mode="w+"
+        ) as json_file:
+            json_dump(obj={"run": run, "devices": fingerprints}, fp=json_file)
+        log.info(
+            f"Rebuilt {n_changed}/{len(fingerprints)} changed devices, "
+            f"saved fingerprints as '{config['output']['fingerprints']}'."
+        )
+        if delta_writer is not None:
+            log.info(
+                f"Saved changed devices as '{config['output']['delta']}'."
+            )
+
+    # * log and save timing metrics of the run * ##############################
+    for name, timer in metrics.summary()["timers"].items():
+        log.debug(
+            f"Timer '{name}': {timer['count']} calls, total "
+            f"{timer['sum']:.3f} s, avg. {timer['mean'] * 1000:.3f} ms, "
+            f"max. {timer['max'] * 1000:.3f} ms."
+        )
+    if config.get("metrics"):
+        try:
+            metrics.export(config["metrics"]["filepath"])
+        except Exception as err:
+            log.warning(f"Couldn't save timing metrics, cause: {err}")
+        else:
+            log.info(
+                f"Saved timing metrics as '{config['metrics']['filepath']}'."
+            )
 
     log.info("All done.")
 
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# the script packages (_downlinks, _types, ...) are imported from the script
+# directory like in gen-downlinks.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
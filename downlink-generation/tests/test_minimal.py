@@ -0,0 +1,50 @@
+from _downlinks.minimal import minimal_downlinks, parameters_of
+
+# full downlink sequence of a device as built by gen-downlinks.py
+DOWNLINKS = [
+    "01000095",  # temporary uplink frequency
+    "0a52",
+    "8278",
+    "83020006",
+    "83020128",
+    "8d020028",
+    "8d020105",
+    "8d020237",
+    "8d02031c",
+    "8d020446",
+    "8d020532",
+    "84020168",
+    "850202d0",
+    "04fc",  # counters reset
+    "01000e10",  # final uplink frequency
+]
+
+
+def test_unknown_state_keeps_full_sequence():
+    assert minimal_downlinks(DOWNLINKS, None) == DOWNLINKS
+
+
+def test_unchanged_device_yields_no_downlinks():
+    assert minimal_downlinks(DOWNLINKS, list(DOWNLINKS)) == []
+
+
+def test_changed_threshold_is_framed():
+    applied = [
+        "8d020500" if downlink == "8d020532" else downlink
+        for downlink in DOWNLINKS
+    ]
+    assert minimal_downlinks(DOWNLINKS, applied) == [
+        "01000095",
+        "8d020532",
+        "04fc",
+        "01000e10",
+    ]
+
+
+def test_changed_final_uplink_frequency_only():
+    applied = DOWNLINKS[:-1] + ["01001c20"]
+    assert minimal_downlinks(DOWNLINKS, applied) == ["01000e10"]
+
+
+def test_last_uplink_frequency_wins():
+    assert parameters_of(DOWNLINKS)["01"] == "01000e10"
@@ -0,0 +1,77 @@
+import pytest
+
+from _downlinks.minimal import minimal_downlinks
+from _downlinks.packing import (
+    DownlinksPacker,
+    MAX_PAYLOAD_SIZES,
+    split_commands,
+)
+
+# full downlink sequence of a device as built by gen-downlinks.py (54 bytes)
+DOWNLINKS = [
+    "01000095",
+    "0a52",
+    "8278",
+    "83020006",
+    "83020128",
+    "8d020028",
+    "8d020105",
+    "8d020237",
+    "8d02031c",
+    "8d020446",
+    "8d020532",
+    "84020168",
+    "850202d0",
+    "04fc",
+    "01000e10",
+]
+
+
+def _unpacked(packed):
+    return [
+        command for payload in packed for command in split_commands(payload)
+    ]
+
+
+@pytest.mark.parametrize("data_rate, n_packed", [(0, 2), (5, 1)])
+def test_pack_keeps_commands_in_order(data_rate, n_packed):
+    max_size = MAX_PAYLOAD_SIZES[data_rate]
+    packed = DownlinksPacker(max_size).pack(DOWNLINKS)
+    assert len(packed) == n_packed
+    assert all(len(payload) <= 2 * max_size for payload in packed)
+    assert _unpacked(packed) == DOWNLINKS
+
+
+@pytest.mark.parametrize("data_rate", [0, 5])
+def test_pack_is_idempotent(data_rate):
+    packer = DownlinksPacker(MAX_PAYLOAD_SIZES[data_rate], cache=False)
+    packed = packer.pack(DOWNLINKS)
+    assert packer.pack(packed) == packed
+
+
+def test_unknown_grammar_is_kept():
+    packed = DownlinksPacker(51).pack(["0a52", "ff", "8278"])
+    assert packed == ["0a52", "ff", "8278"]
+    assert split_commands("ff") is None
+
+
+def test_packed_state_diffs_like_unpacked():
+    applied = [
+        "8d020500" if downlink == "8d020532" else downlink
+        for downlink in DOWNLINKS
+    ]
+    packed = DownlinksPacker(MAX_PAYLOAD_SIZES[0]).pack(applied)
+    assert minimal_downlinks(DOWNLINKS, packed) == minimal_downlinks(
+        DOWNLINKS, applied
+    )
+    assert minimal_downlinks(DOWNLINKS, packed) == [
+        "01000095",
+        "8d020532",
+        "04fc",
+        "01000e10",
+    ]
+
+
+def test_unchanged_packed_state_yields_no_downlinks():
+    packed = DownlinksPacker(MAX_PAYLOAD_SIZES[5]).pack(DOWNLINKS)
+    assert minimal_downlinks(DOWNLINKS, packed) == []
@@ -0,0 +1 @@
+from _downlinks.reader import iter_servers
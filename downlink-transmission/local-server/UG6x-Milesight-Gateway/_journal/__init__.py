@@ -0,0 +1 @@
+from _journal.journal import Journal
@@ -0,0 +1,173 @@
+from json import dumps as json_dumps, loads as json_loads
+from os import fsync, makedirs, path as pathfx
+from time import monotonic
+from typing import Any, Dict, Set, Tuple
+
+JOURNAL_VERSION = 1  # increase if the record format changes
+
+
+class Journal:
+    """Append-only progress journal (JSONL) of a transmission run.
+
+    Every queued downlink is recorded per gateway and device (by index in
+    the device's downlink list) and a device is marked completed once all
+    its downlinks have been queued. Records are written through to the OS
+    immediately (safe if the process dies), but only fsync'ed in batches
+    (every `fsync_every` records or `fsync_interval` seconds).
+
+    The journal belongs to a single input file, identified by its sha256
+    hash. An existing journal of another input file is never resumed.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        digest: str,
+        resume: bool = False,
+        fsync_every: int = 100,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        """Open (and on resume load) the journal.
+
+        Args:
+            filepath (str): Absolute or relative filepath to journal file.
+            digest (str): sha256 hex-digest of the input file.
+            resume (bool, optional): Load the progress of the existing
+                journal and append to it instead of starting a new one.
+                Defaults to False.
+            fsync_every (int, optional): Max. records between two fsync's.
+                Defaults to 100.
+            fsync_interval (float, optional): Max. seconds between two
+                fsync's. Defaults to 1.0.
+        """
+        self.filepath = filepath
+        self.digest = digest
+        self.fsync_every = max(int(fsync_every), 1)
+        self.fsync_interval = float(fsync_interval)
+        self.resumed = False
+        self._torn = False
+        self._queued: Dict[Tuple[str, str], Set[int]] = {}
+        self._completed: Set[Tuple[str, str]] = set()
+        if resume and pathfx.isfile(filepath):
+            self.resumed = self._load()
+        directory = pathfx.dirname(filepath)
+        if directory:
+            makedirs(directory, exist_ok=True)
+        self._file = open(
+            file=filepath,
+            mode="a" if self.resumed else "w",
+            encoding="utf-8",
+        )
+        if self._torn:  # terminate the torn last line of a crashed run
+            self._file.write("\n")
+        self._pending = 0
+        self._synced = monotonic()
+        if not self.resumed:
+            self._append({"version": JOURNAL_VERSION, "input": digest})
+
+    def _load(self) -> bool:
+        """Load the progress of the existing journal.
+
+        Returns:
+            bool: True if the journal belongs to the same input file.
+        """
+        with open(file=self.filepath, mode="r", encoding="utf-8") as file:
+            content = file.read()
+        lines = content.splitlines()
+        if not lines:
+            return False
+        try:
+            header: Dict[str, Any] = json_loads(lines[0])
+        except ValueError:
+            return False
+        if header != {"version": JOURNAL_VERSION, "input": self.digest}:
+            return False
+        for line in lines[1:]:
+            try:
+                record: Dict[str, Any] = json_loads(line)
+            except ValueError:  # torn last line of a crashed run
+                continue
+            key = (record["gateway"], record["device"])
+            if "index" in record:
+                self._queued.setdefault(key, set()).add(record["index"])
+            else:
+                self._completed.add(key)
+        self._torn = not content.endswith("\n")
+        return True
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(len(indices) for indices in self._queued.values())
+
+    def resume_index(self, gateway: str, device: str, total: int) -> int:
+        """Get the index of the first downlink which has to be queued.
+
+        Downlinks are resumed after the last gap-less queued downlink. If a
+        downlink in between has failed, the device is redone from scratch
+        (0), so the order of the device-queue stays intact.
+
+        Args:
+            gateway (str): Gateway address (host:port).
+            device (str): Extended unique identifier (EUI) of the device.
+            total (int): Number of downlinks of the device.
+
+        Returns:
+            int: Index of the first downlink to queue (total if completed).
+        """
+        key = (gateway, device)
+        if key in self._completed:
+            return total
+        indices = self._queued.get(key, set())
+        index = 0
+        while index in indices:
+            index += 1
+        return index if index == len(indices) else 0
+
+    def queued(self, gateway: str, device: str, index: int) -> None:
+        """Record a queued downlink.
+
+        Args:
+            gateway (str): Gateway address (host:port).
+            device (str): Extended unique identifier (EUI) of the device.
+            index (int): Index of the downlink in the device's downlinks.
+        """
+        self._queued.setdefault((gateway, device), set()).add(index)
+        self._append({"gateway": gateway, "device": device, "index": index})
+
+    def completed(self, gateway: str, device: str) -> None:
+        """Record a device whose downlinks have all been queued.
+
+        Args:
+            gateway (str): Gateway address (host:port).
+            device (str): Extended unique identifier (EUI) of the device.
+        """
+        self._completed.add((gateway, device))
+        self._append({"gateway": gateway, "device": device})
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json_dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()  # survives a crash of the process
+        self._pending += 1
+        if (
+            self._pending >= self.fsync_every
+            or monotonic() - self._synced >= self.fsync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force all records to disk (fsync)."""
+        if self._pending:
+            fsync(self._file.fileno())
+        self._pending = 0
+        self._synced = monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
@@ -0,0 +1 @@
+from _metrics.metrics import Metrics
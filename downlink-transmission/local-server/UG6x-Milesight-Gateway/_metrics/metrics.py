@@ -0,0 +1,249 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+from json import dump as json_dump
+from os import makedirs, path as pathfx
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# histogram bucket upper bounds in seconds (+Inf is implicit)
+BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    60.0,
+)
+
+
+class Metrics:
+    """Lightweight registry of timers (histograms) and counters.
+
+    Timers are used as context manager (`with metrics.timer(name)`) or
+    decorator (`@metrics.timed()`, sync and async functions) and record the
+    duration of every call in a fixed-bucket histogram, together with its
+    count, sum, min, max and the number of failed calls (exceptions). The
+    summary is exported as json or in the Prometheus text format.
+    """
+
+    def __init__(
+        self, prefix: str = "app", buckets: Tuple[float, ...] = BUCKETS
+    ) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            prefix (str, optional): Metric name prefix (Prometheus format).
+                Defaults to "app".
+            buckets (Tuple[float, ...], optional): Ascending histogram bucket
+                upper bounds in seconds. Defaults to BUCKETS.
+        """
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._lock = Lock()
+        self._timers: Dict[str, Dict[str, Any]] = {}
+        self._counters: Dict[str, float] = {}
+
+    def _timer(self, name: str) -> Dict[str, Any]:
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = {
+                "count": 0,
+                "failed": 0,
+                "sum": 0.0,
+                "min": float("inf"),
+                "max": 0.0,
+                "buckets": [0] * (len(self.buckets) + 1),
+            }
+        return timer
+
+    def observe(self, name: str, seconds: float, failed: bool = False) -> None:
+        """Record a single duration.
+
+        Args:
+            name (str): Timer name.
+            seconds (float): Duration in seconds.
+            failed (bool, optional): The timed call failed.
+                Defaults to False.
+        """
+        with self._lock:
+            timer = self._timer(name)
+            timer["count"] += 1
+            timer["failed"] += int(failed)
+            timer["sum"] += seconds
+            timer["min"] = min(timer["min"], seconds)
+            timer["max"] = max(timer["max"], seconds)
+            timer["buckets"][bisect_left(self.buckets, seconds)] += 1
+
+    def count(self, name: str, value: float = 1) -> None:
+        """Increase a counter.
+
+        Args:
+            name (str): Counter name.
+            value (float, optional): Increment. Defaults to 1.
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the enclosed block (failed if it raises).
+
+        Args:
+            name (str): Timer name.
+        """
+        start = perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(name, perf_counter() - start, failed=True)
+            raise
+        self.observe(name, perf_counter() - start)
+
+    def timed(self, name: str | None = None) -> Callable:
+        """Decorator timing every call of a (sync or async) function.
+
+        Args:
+            name (str | None, optional): Timer name. Defaults to None
+                (function name).
+
+        Returns:
+            Callable: Decorator.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            _name = name or func.__name__
+
+            if iscoroutinefunction(func):
+
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs) -> Any:
+                    with self.timer(_name):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> Any:
+                with self.timer(_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def drain(self) -> Dict[str, Any]:
+        """Take all records out of the registry (e.g. of a worker process).
+
+        Returns:
+            Dict[str, Any]: Picklable records to `merge` into another
+                registry (with the same buckets).
+        """
+        with self._lock:
+            records = {"timers": self._timers, "counters": self._counters}
+            self._timers, self._counters = {}, {}
+        return records
+
+    def merge(self, records: Dict[str, Any]) -> None:
+        """Add the records of another registry (see `drain`).
+
+        Args:
+            records (Dict[str, Any]): Drained records.
+        """
+        with self._lock:
+            for name, other in records["timers"].items():
+                timer = self._timer(name)
+                for key in ("count", "failed", "sum"):
+                    timer[key] += other[key]
+                timer["min"] = min(timer["min"], other["min"])
+                timer["max"] = max(timer["max"], other["max"])
+                timer["buckets"] = [
+                    a + b for a, b in zip(timer["buckets"], other["buckets"])
+                ]
+            for name, value in records["counters"].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize all timers and counters.
+
+        Returns:
+            Dict[str, Any]: Json serializable summary, histogram buckets are
+                cumulative and keyed by their upper bound (like Prometheus).
+        """
+        timers: Dict[str, Any] = {}
+        for name, timer in self._timers.items():
+            cumulative, buckets = 0, {}
+            for bound, n in zip(
+                self.buckets + (float("inf"),), timer["buckets"]
+            ):
+                cumulative += n
+                buckets[_bound(bound)] = cumulative
+            timers[name] = {
+                "count": timer["count"],
+                "failed": timer["failed"],
+                "sum": timer["sum"],
+                "mean": timer["sum"] / timer["count"],
+                "min": timer["min"],
+                "max": timer["max"],
+                "buckets": buckets,
+            }
+        return {"timers": timers, "counters": dict(self._counters)}
+
+    def prometheus(self) -> str:
+        """Render the summary in the Prometheus text exposition format.
+
+        Returns:
+            str: Histogram `<prefix>_duration_seconds`, counters
+                `<prefix>_failures_total` and `<prefix>_events_total`
+                (labeled by name).
+        """
+        summary = self.summary()
+        lines: List[str] = []
+        metric = f"{self.prefix}_duration_seconds"
+        lines.append(f"# HELP {metric} Duration of timed calls.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, timer in summary["timers"].items():
+            for bound, n in timer["buckets"].items():
+                lines.append(
+                    f'{metric}_bucket{{name="{name}",le="{bound}"}} {n}'
+                )
+            lines.append(f'{metric}_sum{{name="{name}"}} {timer["sum"]}')
+            lines.append(f'{metric}_count{{name="{name}"}} {timer["count"]}')
+        metric = f"{self.prefix}_failures_total"
+        lines.append(f"# HELP {metric} Failed timed calls.")
+        lines.append(f"# TYPE {metric} counter")
+        for name, timer in summary["timers"].items():
+            lines.append(f'{metric}{{name="{name}"}} {timer["failed"]}')
+        metric = f"{self.prefix}_events_total"
+        lines.append(f"# HELP {metric} Counted events.")
+        lines.append(f"# TYPE {metric} counter")
+        for name, value in summary["counters"].items():
+            lines.append(f'{metric}{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, filepath: str) -> None:
+        """Save the summary, in the Prometheus text format if the filepath
+        ends with .prom or .txt, else as json.
+
+        Args:
+            filepath (str): Absolute or relative filepath.
+        """
+        directory = pathfx.dirname(filepath)
+        if directory:
+            makedirs(directory, exist_ok=True)
+        with open(file=filepath, mode="w", encoding="utf-8") as file:
+            if filepath.endswith((".prom", ".txt")):
+                file.write(self.prometheus())
+            else:
+                json_dump(obj=self.summary(), fp=file, indent=2)
+
+
+def _bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
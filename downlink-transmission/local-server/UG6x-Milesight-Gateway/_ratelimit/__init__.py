@@ -0,0 +1,5 @@
+from _ratelimit.limiter import AdaptiveRateLimiter
+from _ratelimit.transport import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+)
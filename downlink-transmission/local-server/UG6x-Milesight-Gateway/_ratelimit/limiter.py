@@ -0,0 +1,85 @@
+from time import monotonic
+
+
+class AdaptiveRateLimiter:
+    """Adaptive token-bucket rate limiter of a single gateway.
+
+    Every request takes one token out of the bucket, which is refilled with
+    `rate` tokens per second up to `burst` tokens. The rate adapts to the
+    gateway (AIMD): it is multiplied by `decrease` after a failed or slow
+    response (timeout, 429, 5xx or latency above `slow`) and increased by
+    `increase` per second worth of fast responses (`increase / rate` each),
+    always within [min_rate, max_rate].
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 5,
+        min_rate: float = 1.0,
+        max_rate: float = 100.0,
+        increase: float = 5.0,
+        decrease: float = 0.5,
+        slow: float = 1.0,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate (float, optional): Initial rate in requests per second.
+                Defaults to 10.0.
+            burst (int, optional): Bucket size (max. tokens).
+                Defaults to 5.
+            min_rate (float, optional): Lower rate limit. Defaults to 1.0.
+            max_rate (float, optional): Upper rate limit. Defaults to 100.0.
+            increase (float, optional): Additive increase of the rate per
+                second worth of fast responses. Defaults to 5.0.
+            decrease (float, optional): Multiplicative decrease of the rate
+                after a failed or slow response. Defaults to 0.5.
+            slow (float, optional): Latency in seconds from which a response
+                counts as slow. Defaults to 1.0.
+        """
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("Rate limits must satisfy 0 < min <= max.")
+        if not 0 < decrease < 1:
+            raise ValueError("Rate decrease factor must be in range (0, 1).")
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.rate = min(max(float(rate), self.min_rate), self.max_rate)
+        self.burst = max(int(burst), 1)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.slow = float(slow)
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+
+    def reserve(self) -> float:
+        """Take a token out of the bucket (possibly in advance).
+
+        The bucket may run into debt, so concurrent callers queue up behind
+        each other instead of all waking up at the same time.
+
+        Returns:
+            float: Delay in seconds the caller has to wait before sending.
+        """
+        now = monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self.rate, self.burst
+        )
+        self._updated = now
+        self._tokens -= 1.0
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def feedback(self, latency: float, failed: bool = False) -> None:
+        """Adapt the rate to the outcome of a request.
+
+        Args:
+            latency (float): Request latency in seconds.
+            failed (bool, optional): True on timeouts, transport errors and
+                overload status codes (429, 5xx). Defaults to False.
+        """
+        if failed or latency > self.slow:
+            self.rate = max(self.rate * self.decrease, self.min_rate)
+        else:
+            self.rate = min(
+                self.rate + self.increase / self.rate, self.max_rate
+            )
@@ -0,0 +1,76 @@
+from asyncio import sleep as async_sleep
+from time import monotonic, sleep
+
+from httpx import (
+    AsyncBaseTransport,
+    BaseTransport,
+    Request,
+    Response,
+    TransportError,
+)
+
+from _ratelimit.limiter import AdaptiveRateLimiter
+
+
+def _overloaded(response: Response) -> bool:
+    """Check if the gateway signals overload (429 or 5xx).
+
+    Args:
+        response (Response): Response of the gateway.
+
+    Returns:
+        bool: True if the response is an overload response.
+    """
+    return response.status_code == 429 or response.status_code >= 500
+
+
+class RateLimitedTransport(BaseTransport):
+    """Transport wrapper which paces all requests of a client (gateway)."""
+
+    def __init__(
+        self, transport: BaseTransport, limiter: AdaptiveRateLimiter
+    ) -> None:
+        self.transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: Request) -> Response:
+        delay = self.limiter.reserve()
+        if delay > 0:
+            sleep(delay)
+        start = monotonic()
+        try:
+            response = self.transport.handle_request(request)
+        except TransportError:  # incl. timeouts
+            self.limiter.feedback(monotonic() - start, failed=True)
+            raise
+        self.limiter.feedback(monotonic() - start, _overloaded(response))
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(AsyncBaseTransport):
+    """Asynchronous transport wrapper (see RateLimitedTransport)."""
+
+    def __init__(
+        self, transport: AsyncBaseTransport, limiter: AdaptiveRateLimiter
+    ) -> None:
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: Request) -> Response:
+        delay = self.limiter.reserve()
+        if delay > 0:
+            await async_sleep(delay)
+        start = monotonic()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except TransportError:  # incl. timeouts
+            self.limiter.feedback(monotonic() - start, failed=True)
+            raise
+        self.limiter.feedback(monotonic() - start, _overloaded(response))
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
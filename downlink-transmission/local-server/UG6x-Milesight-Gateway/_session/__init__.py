@@ -0,0 +1,2 @@
+from _session.auth import SessionAuth
+from _session.tokens import TokenCache
@@ -0,0 +1,85 @@
+from typing import Generator
+
+from httpx import Auth, Request, Response
+
+from _session.tokens import TokenCache
+
+
+class SessionAuth(Auth):
+    """Bearer token authentication of a gateway client (httpx.Auth).
+
+    Requests are sent with the cached session token of the gateway. Without
+    a valid token a login is performed first, and if the gateway rejects a
+    cached token (401) it is dropped and the request is sent once more
+    after a fresh login. Responses of the login endpoint itself (e.g. of
+    `login()`) are used to update the cache.
+    """
+
+    requires_response_body = True
+
+    def __init__(
+        self,
+        cache: TokenCache,
+        key: str,
+        login_url: str,
+        username: str,
+        password: str,
+    ) -> None:
+        """Initialize the authentication flow.
+
+        Args:
+            cache (TokenCache): Token cache (shared by all gateways).
+            key (str): Cache key of gateway and user (see TokenCache.key).
+            login_url (str): Absolute URL of the login endpoint.
+            username (str): UG6x API's username.
+            password (str): UG6x API's password.
+        """
+        self.cache = cache
+        self.key = key
+        self.login_url = login_url
+        self._credentials = {
+            "username": username.strip(),
+            "password": password.strip(),
+        }
+
+    def _login(self) -> Request:
+        return Request("POST", self.login_url, json=self._credentials)
+
+    def _remember(self, response: Response) -> str | None:
+        """Cache the token of a login response.
+
+        Args:
+            response (Response): Response of the login endpoint.
+
+        Returns:
+            str | None: Session token or None if the login failed.
+        """
+        if response.status_code != 200:
+            return None
+        token = response.json().get("jwt")
+        if token:
+            self.cache.put(self.key, token)
+        return token
+
+    def auth_flow(
+        self, request: Request
+    ) -> Generator[Request, Response, None]:
+        if str(request.url) == self.login_url:
+            self._remember((yield request))
+            return
+        token = self.cache.get(self.key)
+        fresh = token is None
+        if fresh:
+            token = self._remember((yield self._login()))
+        if token is not None:
+            request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+        if response.status_code == 401 and not fresh:  # expired or revoked
+            current = self.cache.get(self.key)
+            if current is None or current == token:
+                self.cache.invalidate(self.key)
+                current = self._remember((yield self._login()))
+            token = current  # else renewed by a concurrent request
+            if token is not None:
+                request.headers["Authorization"] = f"Bearer {token}"
+                yield request
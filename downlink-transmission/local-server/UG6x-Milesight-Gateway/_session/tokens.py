@@ -0,0 +1,117 @@
+from base64 import urlsafe_b64decode
+from json import dump as json_dump, load as json_load, loads as json_loads
+from os import chmod, makedirs, path as pathfx, replace
+from time import time
+from typing import Dict
+
+
+def jwt_expiry(token: str) -> float | None:
+    """Read the expiry (exp claim) of a JSON web token without verifying it.
+
+    Args:
+        token (str): JSON web token.
+
+    Returns:
+        float | None: Expiry as unix timestamp or None if unknown.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json_loads(
+            urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except Exception:  # opaque token or no exp claim
+        return None
+
+
+class TokenCache:
+    """Cache of session tokens (JWT) keyed by gateway and username.
+
+    Tokens are kept until they expire (exp claim of the token or `lifetime`
+    after login) minus a safety `margin` (at most half the token lifetime).
+    If a filepath is given, the cache is persisted (readable by the owner
+    only), so consecutive runs reuse the tokens of previous runs.
+    """
+
+    def __init__(
+        self,
+        filepath: str | None = None,
+        lifetime: float = 86400.0,
+        margin: float = 300.0,
+    ) -> None:
+        """Load the persisted tokens (if any).
+
+        Args:
+            filepath (str | None, optional): Absolute or relative filepath to
+                cache file. Defaults to None (in memory only).
+            lifetime (float, optional): Token lifetime in seconds if the
+                token has no exp claim. Defaults to 86400.0 (24h).
+            margin (float, optional): Seconds before expiry from which a
+                token isn't used anymore. Defaults to 300.0.
+        """
+        self.filepath = filepath
+        self.lifetime = float(lifetime)
+        self.margin = float(margin)
+        self._tokens: Dict[str, Dict[str, str | float]] = {}
+        if filepath is not None and pathfx.isfile(filepath):
+            try:
+                with open(file=filepath, mode="r", encoding="utf-8") as file:
+                    self._tokens = json_load(fp=file)
+            except ValueError:  # corrupted cache, start empty
+                self._tokens = {}
+
+    @staticmethod
+    def key(host: str, port: int | str, username: str) -> str:
+        return f"{username}@{host}:{port}"
+
+    def get(self, key: str) -> str | None:
+        """Get a valid (non-expired) token.
+
+        Args:
+            key (str): Cache key (see TokenCache.key).
+
+        Returns:
+            str | None: Token or None if there is no valid token.
+        """
+        entry = self._tokens.get(key)
+        if entry is None or entry["renew"] <= time():
+            return None
+        return entry["token"]
+
+    def put(self, key: str, token: str) -> None:
+        """Store the token of a successful login.
+
+        Args:
+            key (str): Cache key (see TokenCache.key).
+            token (str): Session token (JWT).
+        """
+        now = time()
+        expires = jwt_expiry(token) or now + self.lifetime
+        renew = expires - min(self.margin, (expires - now) / 2)
+        self._tokens[key] = {
+            "token": token,
+            "expires": expires,
+            "renew": renew,
+        }
+        self._save()
+
+    def invalidate(self, key: str) -> None:
+        """Drop a token which has been rejected by the gateway.
+
+        Args:
+            key (str): Cache key (see TokenCache.key).
+        """
+        if self._tokens.pop(key, None) is not None:
+            self._save()
+
+    def _save(self) -> None:
+        if self.filepath is None:
+            return
+        directory = pathfx.dirname(self.filepath)
+        if directory:
+            makedirs(directory, exist_ok=True)
+        tmp = f"{self.filepath}.tmp"
+        with open(file=tmp, mode="w", encoding="utf-8") as file:
+            chmod(tmp, 0o600)  # session tokens are credentials
+            json_dump(obj=self._tokens, fp=file)
+        replace(tmp, self.filepath)  # atomic, no half-written cache
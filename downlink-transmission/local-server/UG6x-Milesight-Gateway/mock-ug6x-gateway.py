@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from argparse import ArgumentParser, Namespace
+from base64 import urlsafe_b64encode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps as json_dumps, loads as json_loads
+from logging import basicConfig, getLogger, Logger, DEBUG, INFO
+from os import path as pathfx
+from random import Random
+from re import compile as compile_regex_pattern
+from secrets import token_hex
+from shutil import which
+from socket import IPPROTO_TCP, TCP_NODELAY
+from ssl import PROTOCOL_TLS_SERVER, SSLContext
+from subprocess import run
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import monotonic, sleep, time
+from typing import Any, Dict, List, Tuple
+
+"""
+This file runs a local stand-in for the HTTP API of a Milesight UG6x
+gateway (login, devices and device-queues), so msb-ug6x-conf.py can be
+tested and benchmarked without a physical gateway. Latency, error rates,
+queue capacity, throughput and session token lifetime are configurable to
+mimic the constraints of the small embedded gateways.
+
+    python mock-ug6x-gateway.py --port 8443 --latency 0.05 --error-rate 0.02
+
+Point a server block of the input file to 127.0.0.1:<port> and enable
+client:insecure (self-signed certificate). GET /mock/stats returns the
+request counters and all device-queues (not part of the gateway API).
+"""
+
+QUEUE_PATH = compile_regex_pattern(r"^/api/devices/([0-9A-Fa-f]{16})/queue$")
+
+log: Logger = getLogger(name="mock-ug6x-gateway")
+
+
+class Gateway:
+    """State of the mocked gateway (sessions, devices and queues)."""
+
+    def __init__(self, args: Namespace) -> None:
+        self.args = args
+        self.lock = Lock()
+        self.random = Random(args.seed)
+        self.sessions: Dict[str, float] = {}  # token -> expiry
+        self.queues: Dict[str, List[Dict[str, Any]]] = {}
+        self.fcnt: Dict[str, int] = {}
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "logins": 0,
+            "unauthorized": 0,
+            "queued": 0,
+            "flushed": 0,
+            "rejected": 0,  # 503 (not applied)
+            "lostResponses": 0,  # 500 (applied)
+            "queueFull": 0,
+            "overloaded": 0,
+        }
+        self.inflight = 0
+        self._next_slot = monotonic()  # throughput cap (see throttle)
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] += 1
+
+    def login(self, body: Dict[str, Any]) -> str | None:
+        """Check the credentials and open a session.
+
+        Args:
+            body (Dict[str, Any]): Request body with username and password.
+
+        Returns:
+            str | None: Session token (JWT) or None if unauthorized.
+        """
+        if (
+            body.get("username") != self.args.username
+            or body.get("password") != self.args.password
+        ):
+            return None
+        expires = time() + self.args.token_ttl
+
+        def encode(dct: Dict[str, Any]) -> str:
+            return urlsafe_b64encode(json_dumps(dct).encode()).decode()
+
+        token = ".".join(
+            (
+                encode({"alg": "none", "typ": "JWT"}).rstrip("="),
+                encode({"exp": int(expires)}).rstrip("="),
+                token_hex(16),
+            )
+        )
+        with self.lock:
+            self.sessions[token] = expires
+            self.stats["logins"] += 1
+        return token
+
+    def authorized(self, header: str | None) -> bool:
+        if not header or not header.startswith("Bearer "):
+            return False
+        with self.lock:
+            expires = self.sessions.get(header[len("Bearer ") :])
+        return expires is not None and expires > time()
+
+    def throttle(self) -> None:
+        """Delay the request according to the throughput cap (--max-rps),
+        i.e. excess requests are queued up (latency grows)."""
+        if not self.args.max_rps:
+            return
+        with self.lock:
+            now = monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + 1.0 / self.args.max_rps
+        if slot > now:
+            sleep(slot - now)
+
+    def latency(self) -> None:
+        with self.lock:
+            jitter = self.random.uniform(-1.0, 1.0) * self.args.jitter
+        sleep(max(self.args.latency + jitter, 0.0))
+
+    def fault(self) -> str | None:
+        """Draw a fault of a queue request.
+
+        Returns:
+            str | None: "reject" (503, not applied), "lose" (500, applied)
+                or None.
+        """
+        with self.lock:
+            r = self.random.random()
+        if r < self.args.error_rate:
+            return "reject"
+        if r < self.args.error_rate + self.args.lost_rate:
+            return "lose"
+        return None
+
+    def enqueue(
+        self, dev_eui: str, body: Dict[str, Any]
+    ) -> Dict[str, Any] | None:
+        """Append a downlink to the device-queue.
+
+        Args:
+            dev_eui (str): Extended unique identifier (EUI) of the device.
+            body (Dict[str, Any]): Request body of the queue request.
+
+        Returns:
+            Dict[str, Any] | None: Queue item or None if the queue is full.
+        """
+        with self.lock:
+            queue = self.queues.setdefault(dev_eui, [])
+            if 0 < self.args.queue_capacity <= len(queue):
+                self.stats["queueFull"] += 1
+                return None
+            self.fcnt[dev_eui] = self.fcnt.get(dev_eui, 0) + 1
+            item = {
+                "devEUI": dev_eui,
+                "confirmed": bool(body.get("confirmed", False)),
+                "fCnt": self.fcnt[dev_eui],
+                "fPort": body.get("fport", 2),
+                "data": body.get("data", ""),
+                "jsonObject": body.get("jsonObject", ""),
+            }
+            queue.append(item)
+            self.stats["queued"] += 1
+        return item
+
+    def flush(self, dev_eui: str) -> None:
+        with self.lock:
+            self.queues[dev_eui] = []
+            self.stats["flushed"] += 1
+
+    def queue(self, dev_eui: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self.queues.get(dev_eui, []))
+
+    def devices(self) -> List[str]:
+        with self.lock:
+            return sorted(self.queues)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "stats": dict(self.stats),
+                "queues": {k: list(v) for k, v in self.queues.items()},
+            }
+
+
+class Handler(BaseHTTPRequestHandler):
+    """HTTP/1.1 (keep-alive) request handler of the mocked gateway API."""
+
+    protocol_version = "HTTP/1.1"
+    gateway: Gateway  # set by serve()
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        log.debug(f"{self.address_string()} - {format % args}")
+
+    def _send(
+        self, status: int, obj: Any, headers: Dict[str, str] | None = None
+    ) -> None:
+        body = json_dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json_loads(self.rfile.read(length) or b"{}")
+
+    def _route(self) -> Tuple[str, str | None]:
+        """Get the route and device EUI of the request path.
+
+        Returns:
+            Tuple[str, str | None]: Route name and device EUI (queue route).
+        """
+        path = self.path.split("?", 1)[0]
+        if path == "/mock/stats":
+            return "stats", None
+        if path == "/api/internal/login":
+            return "login", None
+        if path == "/api/devices":
+            return "devices", None
+        match = QUEUE_PATH.match(path)
+        if match:
+            return "queue", match.group(1).upper()
+        return "unknown", None
+
+    def _handle(self, method: str) -> None:
+        gateway = self.gateway
+        route, dev_eui = self._route()
+        body = self._body() if method == "POST" else {}
+        if route == "stats":
+            return self._send(200, gateway.snapshot())
+        gateway.count("requests")
+        if route == "unknown":
+            return self._send(404, {"error": "not found", "code": 5})
+        with gateway.lock:
+            overloaded = 0 < gateway.args.max_inflight <= gateway.inflight
+            gateway.inflight += not overloaded
+        if overloaded:
+            gateway.count("overloaded")
+            return self._send(
+                503,
+                {"error": "gateway busy", "code": 14},
+                {"Retry-After": "1"},
+            )
+        try:
+            gateway.throttle()
+            gateway.latency()
+            self._dispatch(method, route, dev_eui, body)
+        finally:
+            with gateway.lock:
+                gateway.inflight -= 1
+
+    def _dispatch(
+        self,
+        method: str,
+        route: str,
+        dev_eui: str | None,
+        body: Dict[str, Any],
+    ) -> None:
+        gateway = self.gateway
+        if route == "login":
+            if method != "POST":
+                return self._send(405, {"error": "method not allowed"})
+            token = gateway.login(body)
+            if token is None:
+                gateway.count("unauthorized")
+                return self._send(401, {"error": "invalid credentials"})
+            return self._send(200, {"jwt": token})
+        if not gateway.authorized(self.headers.get("Authorization")):
+            gateway.count("unauthorized")
+            return self._send(401, {"error": "authentication failed"})
+        if route == "devices":
+            devices = gateway.devices()
+            params = dict(
+                p.split("=", 1)
+                for p in self.path.partition("?")[2].split("&")
+                if "=" in p
+            )
+            offset = int(params.get("offset", 0))
+            limit = int(params.get("limit", 1000))
+            return self._send(
+                200,
+                {
+                    "totalCount": str(len(devices)),
+                    "result": [
+                        {"devEUI": dev_eui}
+                        for dev_eui in devices[offset : offset + limit]
+                    ],
+                },
+            )
+        if method == "GET":
+            items = gateway.queue(dev_eui)
+            return self._send(
+                200,
+                {"deviceQueueItems": items, "totalCount": len(items)},
+            )
+        if method == "DELETE":
+            gateway.flush(dev_eui)
+            return self._send(200, {})
+        fault = gateway.fault()
+        if fault == "reject":
+            gateway.count("rejected")
+            return self._send(503, {"error": "gateway busy", "code": 14})
+        item = gateway.enqueue(dev_eui, body)
+        if item is None:
+            return self._send(
+                400, {"error": "device-queue is full", "code": 9}
+            )
+        if fault == "lose":
+            gateway.count("lostResponses")
+            return self._send(500, {"error": "internal error", "code": 13})
+        return self._send(200, {"fCnt": item["fCnt"]})
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+def self_signed_certificate(directory: str) -> Tuple[str, str]:
+    """Create a self-signed certificate for localhost (openssl CLI).
+
+    Args:
+        directory (str): Directory to write certificate and key to.
+
+    Raises:
+        FileNotFoundError: Raised if openssl is not available.
+
+    Returns:
+        Tuple[str, str]: Filepaths to certificate and private key.
+    """
+    if which("openssl") is None:
+        raise FileNotFoundError(
+            "openssl is required to create a self-signed certificate, "
+            "otherwise pass --certfile and --keyfile."
+        )
+    certfile = pathfx.join(directory, "cert.pem")
+    keyfile = pathfx.join(directory, "key.pem")
+    run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-subj",
+            "/CN=localhost",
+            "-days",
+            "1",
+            "-keyout",
+            keyfile,
+            "-out",
+            certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def serve(args: Namespace, certfile: str, keyfile: str) -> None:
+    """Serve the mocked gateway API (HTTPS) until interrupted.
+
+    Args:
+        args (Namespace): Parsed command line arguments.
+        certfile (str): Filepath to TLS certificate.
+        keyfile (str): Filepath to TLS private key.
+    """
+    Handler.gateway = Gateway(args)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    context = SSLContext(PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    log.info(f"Mocked UG6x gateway listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        log.info(f"Stats: {json_dumps(Handler.gateway.stats)}")
+
+
+if __name__ == "__main__":
+    # * parse command line arguments * #######################################
+    parser = ArgumentParser(description="Mocked Milesight UG6x gateway API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--username", default="apiuser")
+    parser.add_argument("--password", default="password")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="+/- seconds of latency"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="share of queue requests rejected with 503 (not queued)",
+    )
+    parser.add_argument(
+        "--lost-rate",
+        type=float,
+        default=0.0,
+        help="share of queue requests answered with 500 although queued",
+    )
+    parser.add_argument(
+        "--queue-capacity",
+        type=int,
+        default=0,
+        help="max. downlinks per device-queue (0: unlimited)",
+    )
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        default=0.0,
+        help="throughput cap in requests per second (0: unlimited)",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=0,
+        help="concurrent requests before answering 503 (0: unlimited)",
+    )
+    parser.add_argument(
+        "--token-ttl",
+        type=float,
+        default=86400.0,
+        help="session token lifetime in seconds",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--certfile", default=None)
+    parser.add_argument("--keyfile", default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    basicConfig(
+        level=DEBUG if args.verbose else INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if args.certfile and args.keyfile:
+        serve(args, args.certfile, args.keyfile)
+    else:
+        with TemporaryDirectory() as directory:
+            serve(args, *self_signed_certificate(directory))
+
+# * EOF * #####################################################################
@@ -1,9 +1,24 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+from argparse import ArgumentParser
+from atexit import register as register_atexit
+from asyncio import (
+    create_task,
+    gather,
+    run as run_async,
+    Semaphore,
+    sleep as async_sleep,
+)
 from base64 import b64encode
+from contextvars import ContextVar
+from cProfile import Profile
 from datetime import datetime
-from inspect import Parameter, signature
-from json import dump as json_save, dumps as json_dump, load as json_load
+from functools import lru_cache, partial
+from hashlib import sha256
+from importlib.util import find_spec
+from inspect import iscoroutinefunction, Parameter, signature
+from itertools import count
+from json import dump as json_save, dumps as json_dump
 from logging import (
     getLogger,
     Logger,
@@ -12,19 +27,63 @@ from logging import (
     StreamHandler,
     DEBUG,
 )
+from logging.handlers import QueueHandler, QueueListener
 from os import getcwd, chdir, path as pathfx, mkdir
 from pathlib import Path
+from queue import Queue
+from random import uniform
+from secrets import token_hex
+from ssl import SSLContext
 from sys import stderr, stdout
-from typing import Any, Callable, Dict
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
-from httpx import Client, HTTPStatusError, Response, Timeout
+from httpx import (
+    AsyncClient,
+    AsyncHTTPTransport,
+    Client,
+    ConnectError,
+    ConnectTimeout,
+    HTTPStatusError,
+    HTTPTransport,
+    Limits,
+    PoolTimeout,
+    Response,
+    Timeout,
+    TransportError,
+    create_ssl_context,
+)
 from yaml import load as yaml_load, SafeLoader as YAMLSafeLoader
 
+from _downlinks import iter_servers
+from _journal import Journal
+from _metrics import Metrics
+from _ratelimit import (
+    AdaptiveRateLimiter,
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+)
+from _session import SessionAuth, TokenCache
+
 # todo: skip server (continue) if authentication failed ..
 
+# timers (per request attempt, see record_attempt) and counters of the run
+metrics = Metrics(prefix="msb_ug6x_conf")
+# debug details of the current device are logged (see sample_debug)
+_sampled: ContextVar[bool] = ContextVar("sampled", default=True)
+
 # * logging methods * #########################################################
 
 
+RETRY_DEFAULTS: Dict[str, Any] = {
+    "attempts": 1,
+    "backoff": 0.5,
+    "maxBackoff": 10.0,
+    "jitter": True,
+    "statusCodes": [429, 500, 502, 503, 504],
+}
+
+
 def init_logger() -> Logger:
     """Initialize global logger with file and stream handler setup
 
@@ -49,7 +108,19 @@ def init_logger() -> Logger:
     file_handler.setFormatter(
         fmt=Formatter(fmt=config["logging"]["fileHandler"]["formatter"])
     )
-    log.addHandler(hdlr=file_handler)
+    if config["logging"]["fileHandler"].get("asynchronous", False):
+        # write the log file in a background thread, so disk I/O doesn't
+        # block the main loop (pending records are written at exit)
+        listener = QueueListener(
+            Queue(), file_handler, respect_handler_level=True
+        )
+        queue_handler = QueueHandler(listener.queue)
+        queue_handler.setLevel(level=file_handler.level)
+        log.addHandler(hdlr=queue_handler)
+        listener.start()
+        register_atexit(listener.stop)
+    else:
+        log.addHandler(hdlr=file_handler)
     log.debug(f"Initialized logger: '{log}'")
     log.debug(f"Initialized logging file handler: {file_handler}")
     # define and register stream handler for stderr or stdout
@@ -85,18 +156,164 @@ def init_logger() -> Logger:
             f"({config['logging']['streamHandler']['console']}): "
             f"{stream_handler}"
         )
+    # records below all handler levels aren't built at all (lazy debug)
+    log.setLevel(level=min(handler.level for handler in log.handlers))
     log.debug(f"Logger setup done.")
 
     return log
 
 
-def trycatchcall(func: Callable) -> Callable:
+def sample_debug(n: int) -> bool:
+    """Decide if the debug details (requests, responses and downlinks) of
+    the n-th device of a gateway are logged, that is debug level is written
+    anywhere and n is a multiple of logging:debugSampling (every device by
+    default). The decision holds for the current device (thread or task).
+
+    Args:
+        n (int): Number of the device (position in the server block).
+
+    Returns:
+        bool: True if the debug details of the device are logged.
+    """
+    global config
+    global log
+    every = max(int(config["logging"].get("debugSampling", 1) or 1), 1)
+    sampled = n % every == 0 and log.isEnabledFor(DEBUG)
+    _sampled.set(sampled)
+    return sampled
+
+
+def debug_sampled() -> bool:
+    """Check if the debug details of the current device are logged.
+
+    Returns:
+        bool: See sample_debug.
+    """
+    global log
+    return _sampled.get() and log.isEnabledFor(DEBUG)
+
+
+def retry_policy() -> Dict[str, Any]:
+    """Get the retry policy of the request methods (client:retry).
+
+    Raises:
+        ValueError: Raised if client:retry:attempts is less than 1.
+
+    Returns:
+        Dict[str, Any]: Retry settings completed with RETRY_DEFAULTS.
+    """
+    global config
+    policy = {**RETRY_DEFAULTS, **(config["client"].get("retry") or {})}
+    if not isinstance(policy["attempts"], int) or policy["attempts"] < 1:
+        raise ValueError("client:retry:attempts must be an integer >= 1.")
+    return policy
+
+
+def _retry_delay(
+    policy: Dict[str, Any], attempt: int, error: Exception
+) -> float | None:
+    """Get the backoff delay before the next attempt of a failed request.
+
+    Args:
+        policy (Dict[str, Any]): Retry policy (see retry_policy).
+        attempt (int): Number of the failed attempt (1, 2, ...).
+        error (Exception): Error of the failed attempt.
+
+    Returns:
+        float | None: Delay in seconds or None if the request must not be
+            retried (non-retryable error or attempts exhausted).
+    """
+    retry_after = None
+    if attempt >= policy["attempts"]:
+        return None
+    if isinstance(error, HTTPStatusError):
+        if error.response.status_code not in policy["statusCodes"]:
+            return None
+        retry_after = error.response.headers.get("retry-after")
+    elif not isinstance(error, TransportError):  # incl. timeouts
+        return None
+    delay = min(policy["backoff"] * 2 ** (attempt - 1), policy["maxBackoff"])
+    if policy["jitter"]:
+        delay = uniform(0, delay)  # full jitter
+    if retry_after is not None and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    return delay
+
+
+def _maybe_applied(error: Exception) -> bool:
+    """Check if a failed request might have been applied by the server.
+
+    Args:
+        error (Exception): Error of the failed attempt.
+
+    Returns:
+        bool: False if the request has been refused for sure.
+    """
+    if isinstance(error, (ConnectError, ConnectTimeout, PoolTimeout)):
+        return False  # never reached the server
+    if isinstance(error, HTTPStatusError):
+        return error.response.status_code not in (429, 503)
+    return True
+
+
+def record_attempt(
+    name: str, attempt: int, seconds: float, failed: bool = False
+) -> None:
+    """Record the timing of a single request attempt.
+
+    Args:
+        name (str): Name of the request method.
+        attempt (int): Number of the attempt (1, 2, ...).
+        seconds (float): Duration of the attempt in seconds.
+        failed (bool, optional): Attempt failed. Defaults to False.
+    """
+    global log
+    global metrics
+    metrics.observe(name, seconds, failed=failed)
+    if attempt == 1:
+        metrics.count(f"{name}_calls")
+    if debug_sampled():
+        log.debug(
+            "Attempt %d of '%s' took %.1f ms%s",
+            attempt,
+            name,
+            seconds * 1000,
+            " (failed)" if failed else "",
+        )
+
+
+def _log_call_error(name: str, error: Exception) -> None:
+    global log
+    if isinstance(error, HTTPStatusError):
+        log.error(
+            f"Got invalid HTTP status code after calling {name}: "
+            f"{error.response.status_code} != 200 (OK) >>> {error}"
+        )
+    else:
+        log.critical(
+            f"Request (API call) '{name}' couldn't processed, cause: {error}"
+        )
+
+
+def trycatchcall(
+    func: Callable | None = None, *, applied: Callable | None = None
+) -> Callable:
     """Request / API call decorator to check positional and keyword arguments
     and catch and log invalid HTTP status codes and other occouring exceptions
     without exiting the script.
 
+    Failed calls are retried with exponential backoff and jitter according
+    to client:retry, for transport errors (incl. timeouts) and retryable
+    status codes only. Non-idempotent requests pass an `applied` check,
+    which is called before retrying a request which might have reached the
+    server anyway, so it isn't applied twice.
+
     Args:
         func (Callable): Request / API call method (below defined functions)
+        applied (Callable | None, optional): Called with the arguments of
+            the request. Returns a Response if the request has already been
+            applied, None if not and raises if it can't tell (no retry).
+            Defaults to None (idempotent request).
 
     Raises:
         ModuleNotFoundError: Raised if no global logger has been found.
@@ -105,6 +322,8 @@ def trycatchcall(func: Callable) -> Callable:
         Callable: Wrapped request method / function.
     """
     global log
+    if func is None:  # used as @trycatchcall(applied=...)
+        return partial(trycatchcall, applied=applied)
     # ! logger can not be found dynamically inside the decorator because the
     # ! instance does not exist at the time of decoration is beeing processed
     # globalvars = globals()
@@ -154,28 +373,106 @@ def trycatchcall(func: Callable) -> Callable:
         #                 f"Positional argument '{param}' should be of type "
         #                 f"{expected_type}"
         #             )
-        # wrap and process call
-        try:
-            response: Response = func(*args, **kwargs)
-            response.raise_for_status()
-        except HTTPStatusError as httperr:
-            log.error(
-                f"Got invalid HTTP status code after calling {func.__name__}: "
-                f"{response.status_code} != 200 (OK) >>> {httperr}"
+        # wrap and process call (retried according to client:retry)
+        policy = retry_policy()
+        for attempt in range(1, policy["attempts"] + 1):
+            response, start = None, perf_counter()
+            try:
+                response = func(*args, **kwargs)
+                response.raise_for_status()
+            except Exception as err:
+                error = err
+            else:
+                record_attempt(func.__name__, attempt, perf_counter() - start)
+                if debug_sampled():
+                    log.debug(
+                        "Successfully called '%s' (API call), "
+                        "Response.json() (dump): %s",
+                        func.__name__,
+                        json_dump(response.json()),
+                    )
+                return response
+            record_attempt(
+                func.__name__, attempt, perf_counter() - start, True
             )
-        except Exception as err:
-            log.critical(
-                f"Request (API call) '{func.__name__}' couldn't processed, "
-                f"cause: {err}"
+            delay = _retry_delay(policy, attempt, error)
+            if delay is None:
+                break
+            if applied is not None and _maybe_applied(error):
+                try:
+                    response = applied(*args, **kwargs)
+                except Exception as err:
+                    log.error(
+                        f"Couldn't verify if '{func.__name__}' has been "
+                        f"applied, giving up: {err}"
+                    )
+                    break
+                if response is not None:
+                    log.info(
+                        f"Request '{func.__name__}' has been applied "
+                        f"despite: {error!r}"
+                    )
+                    return response
+            log.warning(
+                f"Attempt {attempt}/{policy['attempts']} of '{func.__name__}' "
+                f"failed ({error!r}), retrying in {delay:.2f}s ..."
             )
-        else:
-            log.debug(
-                f"Successfully called '{func.__name__}' (API call), "
-                f"Response.json() (dump): {json_dump(response.json())}"
+            sleep(delay)
+        _log_call_error(func.__name__, error)
+
+    async def async_wrapper(*args, **kwargs) -> Response:
+        """Wrapper for asynchronous request methods (same as `wrapper`)
+
+        Returns:
+            Response: httpx.Response object with json() method
+        """
+        policy = retry_policy()
+        for attempt in range(1, policy["attempts"] + 1):
+            response, start = None, perf_counter()
+            try:
+                response = await func(*args, **kwargs)
+                response.raise_for_status()
+            except Exception as err:
+                error = err
+            else:
+                record_attempt(func.__name__, attempt, perf_counter() - start)
+                if debug_sampled():
+                    log.debug(
+                        "Successfully called '%s' (API call), "
+                        "Response.json() (dump): %s",
+                        func.__name__,
+                        json_dump(response.json()),
+                    )
+                return response
+            record_attempt(
+                func.__name__, attempt, perf_counter() - start, True
+            )
+            delay = _retry_delay(policy, attempt, error)
+            if delay is None:
+                break
+            if applied is not None and _maybe_applied(error):
+                try:
+                    response = await applied(*args, **kwargs)
+                except Exception as err:
+                    log.error(
+                        f"Couldn't verify if '{func.__name__}' has been "
+                        f"applied, giving up: {err}"
+                    )
+                    break
+                if response is not None:
+                    log.info(
+                        f"Request '{func.__name__}' has been applied "
+                        f"despite: {error!r}"
+                    )
+                    return response
+            log.warning(
+                f"Attempt {attempt}/{policy['attempts']} of '{func.__name__}' "
+                f"failed ({error!r}), retrying in {delay:.2f}s ..."
             )
-            return response
+            await async_sleep(delay)
+        _log_call_error(func.__name__, error)
 
-    return wrapper
+    return async_wrapper if iscoroutinefunction(func) else wrapper
 
 
 # * request methods * #########################################################
@@ -256,7 +553,68 @@ def flush_downlink_queue(devEUI: str) -> Response:
     return client.delete(f"/devices/{devEUI}/queue")
 
 
-@trycatchcall
+def downlink_references() -> Iterator[str]:
+    """Generate unique downlink references (`<run id>-<counter>`).
+
+    The random run id keeps references of a run apart from queue items of
+    earlier runs (e.g. not flushed on --resume), the counter keeps retried
+    or repeated downlinks of a run apart, so a queue item is never mistaken
+    for another downlink (see _queued).
+
+    Returns:
+        Iterator[str]: References, one per queued downlink.
+    """
+    run = token_hex(4)
+    return (f"{run}-{n}" for n in count(1))
+
+
+def _queued(dct: Dict[str, Any], payload: Dict[str, Any]) -> bool:
+    """Check if a downlink (request body) is in a device-queue.
+
+    Queue items are matched by reference. If the gateway doesn't return
+    references, the last queue item has to match data and fport (downlinks
+    of a device are queued one after another).
+
+    Args:
+        dct (Dict[str, Any]): Device-queue (get_downlink_queue json).
+        payload (Dict[str, Any]): Request body of queue_downlink.
+
+    Returns:
+        bool: True if the downlink is in the device-queue.
+    """
+    items = dct.get("deviceQueueItems") or []
+    if any("reference" in item for item in items):
+        return any(
+            item.get("reference") == payload["reference"] for item in items
+        )
+    return bool(items) and (
+        items[-1].get("data") == payload["data"]
+        and items[-1].get("fPort", payload["fport"]) == payload["fport"]
+    )
+
+
+def downlink_queued(
+    devEUI: str, data: str, *, reference: str | None = None, **kwargs
+) -> Response | None:
+    """Idempotency check of queue_downlink (see trycatchcall)
+
+    Raises:
+        ValueError: Raised if the downlink has no reference.
+        ConnectionError: Raised if the device-queue couldn't be loaded.
+
+    Returns:
+        Response | None: Device-queue response if the downlink is queued.
+    """
+    if reference is None:
+        raise ValueError("Downlink without reference can't be verified.")
+    response = get_downlink_queue(devEUI)
+    if response is None:
+        raise ConnectionError(f"Couldn't load device-queue of {devEUI}.")
+    payload = _downlink_payload(devEUI, data, reference=reference, **kwargs)
+    return response if _queued(response.json(), payload) else None
+
+
+@trycatchcall(applied=downlink_queued)
 def queue_downlink(
     devEUI: str,
     data: str,
@@ -285,8 +643,35 @@ def queue_downlink(
         convert_to_base64 (bool, optional): Enable base64 conversion from hex.
             Defaults to True.
     """
-    global config
     global client
+    data = _downlink_payload(
+        devEUI,
+        data,
+        fport=fport,
+        confirmed=confirmed,
+        jsonObject=jsonObject,
+        reference=reference,
+        convert_to_base64=convert_to_base64,
+    )
+    return client.post(f"/devices/{devEUI}/queue", json=data)
+
+
+def _downlink_payload(
+    devEUI: str,
+    data: str,
+    *,
+    fport: int = 2,
+    confirmed: bool = True,
+    jsonObject: dict | None = None,
+    reference: str | None = None,
+    convert_to_base64: bool = True,
+) -> Dict[str, Any]:
+    """Build the JSON body of a queue downlink request (see queue_downlink)
+
+    Returns:
+        Dict[str, Any]: Request body as python dictionary (JSON object)
+    """
+    global config
     data = {
         "fport": fport,
         "devEUI": devEUI,
@@ -297,12 +682,100 @@ def queue_downlink(
         else data.strip().lower(),
         "confirmed": confirmed,
     }
-    log.info(f"bool:{convert_to_base64}, data: {data['data']}")
+    if debug_sampled():
+        log.debug("bool:%s, data: %s", convert_to_base64, data["data"])
     if isinstance(jsonObject, dict):
         data["jsonObject"] = jsonObject
     if isinstance(reference, str):
         data["reference"] = reference.strip()
-    return client.post(f"/devices/{devEUI}/queue", json=data)
+    return data
+
+
+# * asynchronous request methods * ############################################
+
+
+@trycatchcall
+async def async_login(
+    client: AsyncClient, username: str = "apiuser", password: str = "password"
+) -> Response:
+    """Login using UG6x username and password for authentication (async)
+
+    Args:
+        client (AsyncClient): Asynchronous client of the gateway.
+        username (str, optional): UG6x API's username, defaults to "apiuser".
+        password (str, optional): UH6x API's password, defaults to "password".
+
+    Returns:
+        Response: httpx.Response object with status_code attr and json() method
+    """
+    credentials = {"username": username.strip(), "password": password.strip()}
+    response = await client.post("/internal/login", json=credentials)
+    if response.status_code == 200:
+        dct = response.json()
+        if "jwt" in dct:
+            client.headers.update({"Authorization": f"Bearer {dct['jwt']}"})
+
+    return response
+
+
+@trycatchcall
+async def async_flush_downlink_queue(
+    client: AsyncClient, devEUI: str
+) -> Response:
+    """Flush (delete) the downlink device-queue (async)
+
+    Args:
+        client (AsyncClient): Asynchronous client of the gateway.
+        devEUI (str): Extended unique identifier (EUI) of the device.
+    """
+    return await client.delete(f"/devices/{devEUI}/queue")
+
+
+@trycatchcall
+async def async_get_downlink_queue(
+    client: AsyncClient, devEUI: str
+) -> Response:
+    """Get all downlink items in the device-queue (async)
+
+    Args:
+        client (AsyncClient): Asynchronous client of the gateway.
+        devEUI (str): Extended unique identifier (EUI) of the device.
+    """
+    return await client.get(f"/devices/{devEUI}/queue")
+
+
+async def async_downlink_queued(
+    client: AsyncClient,
+    devEUI: str,
+    data: str,
+    *,
+    reference: str | None = None,
+    **kwargs,
+) -> Response | None:
+    """Idempotency check of async_queue_downlink (see downlink_queued)"""
+    if reference is None:
+        raise ValueError("Downlink without reference can't be verified.")
+    response = await async_get_downlink_queue(client, devEUI)
+    if response is None:
+        raise ConnectionError(f"Couldn't load device-queue of {devEUI}.")
+    payload = _downlink_payload(devEUI, data, reference=reference, **kwargs)
+    return response if _queued(response.json(), payload) else None
+
+
+@trycatchcall(applied=async_downlink_queued)
+async def async_queue_downlink(
+    client: AsyncClient, devEUI: str, data: str, **kwargs
+) -> Response:
+    """Queue a downlink into downlink device-queue (async)
+
+    Args:
+        client (AsyncClient): Asynchronous client of the gateway.
+        devEUI (str): Extended unique identifier (EUI) of the device.
+        data (str): Payload as hexdigits (downlink message).
+        **kwargs: Keyword arguments of queue_downlink.
+    """
+    data = _downlink_payload(devEUI, data, **kwargs)
+    return await client.post(f"/devices/{devEUI}/queue", json=data)
 
 
 # * helper classes and functions * ############################################
@@ -322,16 +795,489 @@ def import_yaml_config(filepath: str | Path) -> Dict[str, Any]:
 def _trace(_dev_eui: bool = True) -> str:
     global server
     global dev_eui
-    return (
-        f"{server['address']['host']}:{server['address']['port']}/{dev_eui}"
-        if _dev_eui
-        else f"{server['address']['host']}:{server['address']['port']}"
+    return _trace_of(server, dev_eui if _dev_eui else None)
+
+
+def _trace_of(server: Dict[str, Any], dev_eui: str | None = None) -> str:
+    address = f"{server['address']['host']}:{server['address']['port']}"
+    return address if dev_eui is None else f"{address}/{dev_eui}"
+
+
+def resume_index(
+    server: Dict[str, Any], dev_eui: str, downlinks: List[str]
+) -> int:
+    """Get the index of the first downlink of a device which has to be
+    queued, according to the progress journal (0 without journal).
+
+    Args:
+        server (Dict[str, Any]): Server block of the input file.
+        dev_eui (str): Extended unique identifier (EUI) of the device.
+        downlinks (List[str]): Ordered downlinks (hex-strings).
+
+    Returns:
+        int: Index of the first downlink to queue (len(downlinks) if the
+            device has been completed).
+    """
+    global journal
+    global log
+    if journal is None:
+        return 0
+    index = journal.resume_index(_trace_of(server), dev_eui, len(downlinks))
+    if 0 < index < len(downlinks):
+        log.info(
+            f"Resuming {_trace_of(server, dev_eui)} at downlink "
+            f"{index + 1}/{len(downlinks)}"
+        )
+    return index
+
+
+def rate_limiter(server: Dict[str, Any]) -> AdaptiveRateLimiter | None:
+    """Get (or create) the adaptive rate limiter of a gateway.
+
+    Args:
+        server (Dict[str, Any]): Server block of the input file.
+
+    Returns:
+        AdaptiveRateLimiter | None: Rate limiter of the gateway or None if
+            rate limiting is disabled (client:rateLimit).
+    """
+    global config
+    global limiters
+    settings = config["client"].get("rateLimit")
+    if not settings:
+        return None
+    trace = _trace_of(server)
+    if trace not in limiters:
+        limiters[trace] = AdaptiveRateLimiter(
+            rate=settings.get("rate", 10.0),
+            burst=settings.get("burst", 5),
+            min_rate=settings.get("minRate", 1.0),
+            max_rate=settings.get("maxRate", 100.0),
+            increase=settings.get("increase", 5.0),
+            decrease=settings.get("decrease", 0.5),
+            slow=settings.get("slowLatency", 1.0),
+        )
+    return limiters[trace]
+
+
+def log_rate_limit(server: Dict[str, Any]) -> None:
+    """Log the rate limit a gateway has settled at (if rate limited).
+
+    Args:
+        server (Dict[str, Any]): Server block of the input file.
+    """
+    global log
+    limiter = rate_limiter(server)
+    if limiter is not None:
+        log.info(
+            f"Rate limit of {_trace_of(server)} settled at "
+            f"{limiter.rate:.1f} req/s"
+        )
+
+
+def _base_url(server: Dict[str, Any]) -> str:
+    return "https://{addr}:{port}/api".format(
+        addr=server["address"]["host"], port=server["address"]["port"]
     )
 
 
+def token_key(server: Dict[str, Any]) -> str:
+    """Get the session token cache key of a server block.
+
+    Args:
+        server (Dict[str, Any]): Server block of the input file.
+
+    Returns:
+        str: Cache key (username@host:port).
+    """
+    return TokenCache.key(
+        server["address"]["host"],
+        server["address"]["port"],
+        server["credentials"]["username"].strip(),
+    )
+
+
+@lru_cache(maxsize=None)
+def ssl_context() -> SSLContext:
+    """Get the TLS context shared by all clients (CA certificates are only
+    loaded once instead of once per client).
+
+    Returns:
+        SSLContext: TLS context of the configured verification mode.
+    """
+    global config
+    return create_ssl_context(
+        verify=(not config["client"]["insecure"]),
+        trust_env=config["client"]["enableEnvVars"],
+        http2=http2_enabled(),
+    )
+
+
+@lru_cache(maxsize=None)
+def http2_enabled() -> bool:
+    """Check if HTTP/2 is enabled (client:http2) and available.
+
+    Returns:
+        bool: True if the clients should negotiate HTTP/2.
+    """
+    global config
+    global log
+    if not config["client"].get("http2", False):
+        return False
+    if find_spec("h2") is None:
+        log.warning(
+            "HTTP/2 requires the optional 'h2' package "
+            "(pip install httpx[http2]), falling back to HTTP/1.1."
+        )
+        return False
+    return True
+
+
+def pool_limits() -> Limits:
+    """Get the connection pool limits of a client (client:pool).
+
+    Returns:
+        Limits: Max. connections, max. keep-alive connections and keep-alive
+            expiry (seconds) of the connection pool.
+    """
+    global config
+    pool = config["client"].get("pool") or {}
+    return Limits(
+        max_connections=pool.get("maxConnections", 10),
+        max_keepalive_connections=pool.get("maxKeepalive", 10),
+        keepalive_expiry=pool.get("keepaliveExpiry", 30.0),
+    )
+
+
+def client_settings(
+    server: Dict[str, Any], asynchronous: bool = False
+) -> Dict[str, Any]:
+    """Keyword arguments to create a (sync or async) client for a server.
+
+    Args:
+        server (Dict[str, Any]): Server block of the input file.
+        asynchronous (bool, optional): Settings for httpx.AsyncClient.
+            Defaults to False.
+
+    Returns:
+        Dict[str, Any]: httpx.Client / httpx.AsyncClient keyword arguments.
+    """
+    global config
+    global tokens
+    transport = (AsyncHTTPTransport if asynchronous else HTTPTransport)(
+        verify=ssl_context(),
+        http2=http2_enabled(),
+        limits=pool_limits(),
+        trust_env=config["client"]["enableEnvVars"],
+    )
+    limiter = rate_limiter(server)
+    if limiter is not None:
+        transport = (
+            AsyncRateLimitedTransport(transport, limiter)
+            if asynchronous
+            else RateLimitedTransport(transport, limiter)
+        )
+    return dict(
+        transport=transport,
+        base_url=_base_url(server),
+        auth=SessionAuth(
+            tokens,
+            token_key(server),
+            f"{_base_url(server)}/internal/login",
+            server["credentials"]["username"],
+            server["credentials"]["password"],
+        ),
+        headers={
+            "accept": "application/json",
+            "content-type": "application/json",
+        },
+        timeout=Timeout(
+            **config["client"]["timeouts"]
+            if config["client"]["timeouts"]
+            else 5.0
+        ),
+        trust_env=config["client"]["enableEnvVars"],
+        verify=(not config["client"]["insecure"]),
+        default_encoding=config["client"]["encoding"],
+    )
+
+
+# * asynchronous transmission * ###############################################
+
+
+async def transmit_device_async(
+    client: AsyncClient,
+    server: Dict[str, Any],
+    dev_eui: str,
+    downlinks: List[str],
+    references: Iterator[str],
+) -> int | None:
+    """Flush (optional) and queue all downlinks of a device in order.
+
+    Args:
+        client (AsyncClient): Asynchronous client of the gateway.
+        server (Dict[str, Any]): Server block of the input file.
+        dev_eui (str): Extended unique identifier (EUI) of the device.
+        downlinks (List[str]): Ordered downlinks (hex-strings).
+        references (Iterator[str]): Shared downlink references (see
+            downlink_references).
+
+    Returns:
+        int | None: Number of queued downlinks, None if the device was
+            skipped because its queue couldn't be flushed.
+    """
+    global journal
+    global log
+    n_downlinks = 0
+    dev_eui = dev_eui.strip().upper()
+    start = resume_index(server, dev_eui, downlinks)
+    if downlinks and start == len(downlinks):
+        log.info(f"Skipping completed device {_trace_of(server, dev_eui)}.")
+        return 0
+    if server["downlinkSettings"]["flushQueue"] and not start:
+        # don't queue on top of stale downlinks
+        if await async_flush_downlink_queue(client, dev_eui) is None:
+            log.error(
+                f"Failed to erase queue of {_trace_of(server, dev_eui)}, "
+                "skipping device."
+            )
+            return None
+        log.info(
+            "Flushed (deleted) all queued downlinks of "
+            f"{_trace_of(server, dev_eui)}"
+        )
+    for index in range(start, len(downlinks)):  # sequential, keeps order
+        downlink = downlinks[index]
+        response = await async_queue_downlink(
+            client,
+            dev_eui,
+            downlink,
+            fport=server["downlinkSettings"]["fport"],
+            confirmed=server["downlinkSettings"]["confirmed"],
+            reference=next(references),
+        )
+        if response is not None and response.status_code == 200:
+            n_downlinks += 1
+            if journal is not None:
+                journal.queued(_trace_of(server), dev_eui, index)
+            if debug_sampled():
+                log.debug(
+                    "Added downlink '%s' to %s queue.",
+                    downlink,
+                    _trace_of(server, dev_eui),
+                )
+        else:
+            log.error(
+                f"Failed to add downlink '{downlink}' to "
+                f"{_trace_of(server, dev_eui)} queue."
+            )
+    log.info(f"Queued downlinks for {_trace_of(server, dev_eui)}")
+    if journal is not None and start + n_downlinks == len(downlinks):
+        journal.completed(_trace_of(server), dev_eui)
+    return n_downlinks
+
+
+async def transmit_server_async(
+    server: Dict[str, Any], references: Iterator[str]
+) -> Tuple[int, int]:
+    """Login and transmit the downlinks of all devices of a gateway, with up
+    to `client:concurrency` devices being processed concurrently.
+
+    Args:
+        server (Dict[str, Any]): Server block of the input file.
+        references (Iterator[str]): Shared downlink references (see
+            downlink_references).
+
+    Returns:
+        Tuple[int, int]: Number of processed devices and queued downlinks.
+    """
+    global config
+    global log
+    global tokens
+    semaphore = Semaphore(config["client"].get("concurrency", 8))
+
+    async def limited(n: int, dev_eui: str, downlinks: List[str]) -> int:
+        sample_debug(n)  # task local
+        async with semaphore:
+            return await transmit_device_async(
+                client, server, dev_eui, downlinks, references
+            )
+
+    try:
+        client = AsyncClient(**client_settings(server, True))
+    except Exception as err:
+        log.critical(
+            f"Failed client initialization: {err}. Skipping server block ..."
+        )
+        return 0, 0
+    async with client:
+        log.debug(f"Initialized client: {client}")
+        try:
+            if tokens.get(token_key(server)) is not None:
+                log.info(
+                    f"Reusing cached session token of {_trace_of(server)}"
+                )
+            else:
+                await async_login(
+                    client,
+                    server["credentials"]["username"],
+                    server["credentials"]["password"],
+                )
+        except Exception as err:
+            log.critical(f"Failed login: {err}. Skipping server block ...")
+            return 0, 0
+        if tokens.get(token_key(server)) is None:
+            log.critical(
+                f"Login to server '{_trace_of(server)}' failed. "
+                "Skipping server block ..."
+            )
+            return 0, 0
+        results = await gather(
+            *(
+                limited(n, dev_eui, downlinks)
+                for n, (dev_eui, downlinks) in enumerate(
+                    server["downlinks"].items()
+                )
+            ),
+            return_exceptions=True,
+        )
+    n_devices, n_downlinks = 0, 0
+    for dev_eui, result in zip(server["downlinks"], results):
+        if isinstance(result, BaseException):
+            log.critical(
+                "Unexpected error during device processing of "
+                f"{_trace_of(server, dev_eui)} {result}"
+            )
+        elif result is not None:  # None: skipped (queue not flushed)
+            n_devices += 1
+            n_downlinks += result
+            log.info(
+                f"Successfully processed device {_trace_of(server, dev_eui)}."
+            )
+    log_rate_limit(server)
+    return n_devices, n_downlinks
+
+
+async def transmit_async(
+    servers: Iterator[Dict[str, Any]]
+) -> Tuple[int, int, int]:
+    """Transmit the downlinks of all gateways concurrently, each gateway is
+    started as soon as its server block has been read.
+
+    Args:
+        servers (Iterator[Dict[str, Any]]): Server blocks of the input file.
+
+    Returns:
+        Tuple[int, int, int]: Number of processed gateways, devices and
+            queued downlinks.
+    """
+    global log
+    references = downlink_references()
+    tasks = []
+    for server in servers:
+        tasks.append(create_task(transmit_server_async(server, references)))
+        await async_sleep(0)  # let started gateways proceed while reading
+    results = await gather(*tasks, return_exceptions=True)
+    for n, result in enumerate(results):
+        if isinstance(result, BaseException):  # don't abort other gateways
+            log.critical(
+                f"Unexpected error during processing of server block {n}: "
+                f"{result!r}"
+            )
+            results[n] = (0, 0)
+    n_gateways = sum(1 for n_devices, _ in results if n_devices)
+    n_devices = sum(n_devices for n_devices, _ in results)
+    n_downlinks = sum(n_downlinks for _, n_downlinks in results)
+    return n_gateways, n_devices, n_downlinks
+
+
+def file_digest(filepath: str, chunksize: int = 1 << 20) -> str:
+    """Get sha256 hex-digest of a file (read in chunks).
+
+    Args:
+        filepath (str): Absolute or relative filepath.
+        chunksize (int, optional): Bytes read at once. Defaults to 1 MiB.
+
+    Returns:
+        str: Hex-digest.
+    """
+    digest = sha256()
+    with open(file=filepath, mode="rb") as file:
+        while chunk := file.read(chunksize):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tally_servers(
+    servers: Iterator[Dict[str, Any]], totals: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    """Count gateways, devices and downlinks of the streamed input file.
+
+    Args:
+        servers (Iterator[Dict[str, Any]]): Server blocks of the input file.
+        totals (Dict[str, int]): Counters "gateways", "devices" and
+            "downlinks" (updated in place).
+
+    Yields:
+        Iterator[Dict[str, Any]]: Server blocks.
+    """
+    global log
+    try:
+        for server in servers:
+            totals["gateways"] += 1
+            totals["devices"] += len(server["downlinks"])
+            totals["downlinks"] += sum(map(len, server["downlinks"].values()))
+            yield server
+    except Exception as err:  # e.g. truncated, remaining gateways skipped
+        log.critical(f"Couldn't read input file, cause: {err}")
+
+
+def dump_profile(profiler: Profile, filepath: str) -> None:
+    """Stop the profiler and save its stats (see pstats.Stats).
+
+    Args:
+        profiler (Profile): Enabled profiler of the run.
+        filepath (str): Absolute or relative filepath to stats file.
+    """
+    profiler.disable()
+    profiler.dump_stats(filepath)
+    print(f"Saved profile stats as '{filepath}'.", file=stderr)
+
+
 # ! Script Section ! ##########################################################
 
 if __name__ == "__main__":
+    # * parse command line arguments * #######################################
+    parser = ArgumentParser(
+        description="Transmit MSB configuration downlinks to UG6x gateways."
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="filepath to configuration yaml file (default: ./config.yaml)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip downlinks already queued according to the journal",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="./msb-ug6x-conf.pstats",
+        default=None,
+        help="profile the run (cProfile) and save the stats file "
+        "(default: ./msb-ug6x-conf.pstats)",
+    )
+    args = parser.parse_args()
+    if args.config:  # resolve before changing the work directory
+        args.config = pathfx.abspath(args.config)
+    if args.profile:  # saved at exit, also if the run fails
+        args.profile = pathfx.abspath(args.profile)
+        profiler = Profile()
+        register_atexit(dump_profile, profiler, args.profile)
+        profiler.enable()
+
     # * fix work directory * ##################################################
     workdir = Path("downlink-transmission/local-server/UG6x-Milesight-Gateway")
     if not getcwd().endswith(str(workdir)):
@@ -339,7 +1285,8 @@ if __name__ == "__main__":
         # print(f"CWD: {getcwd()}")
 
     # * import global config * ################################################
-    for file in ["./config.yaml", "./config.yml", "./config.example.yaml"]:
+    files = ["./config.yaml", "./config.yml", "./config.example.yaml"]
+    for file in [args.config] if args.config else files:
         if pathfx.isfile(file):
             config = import_yaml_config(filepath=file)
             break
@@ -350,6 +1297,7 @@ if __name__ == "__main__":
     # * create logger instance * ##############################################
     log = init_logger()
     log.info(f"CWD: {workdir.absolute()}")
+    retry_policy()  # fail early on an invalid retry policy (client:retry)
 
     # * load input file * #####################################################
     try:
@@ -363,10 +1311,12 @@ if __name__ == "__main__":
             )
         else:
             log.critical(f"Couldn't load any input file.")
-        with open(file=file, mode="r") as json_file:
-            dct = json_load(fp=json_file)
-            # todo: needs refactoring (cause config has been changed)
-            # queueBackups = config["globalSettings"]["queueBackupDir"]
+        digest = file_digest(file)  # identifies the journal
+        # server blocks are parsed one after another while transmitting
+        totals = {"gateways": 0, "devices": 0, "downlinks": 0}
+        servers = tally_servers(iter_servers(file), totals)
+        # todo: needs refactoring (cause config has been changed)
+        # queueBackups = config["globalSettings"]["queueBackupDir"]
     except Exception as err:
         log.critical(
             f"Couldn't load input file with generated downlinks: {err}"
@@ -392,168 +1342,233 @@ if __name__ == "__main__":
     # except Exception as err:
     #     log.critical(f"Couldn't fix non-existant directory: {err}")
 
+    # * load session token cache (see SessionAuth) *
+    tokens = TokenCache(
+        config["client"].get("tokenCache"),
+        lifetime=config["client"].get("tokenLifetime", 86400.0),
+    )
+
+    # * open progress journal (optional) *
+    journal: Journal | None = None
+    if config.get("journal"):
+        journal = Journal(
+            config["journal"]["filepath"],
+            digest,
+            resume=args.resume,
+            fsync_every=config["journal"].get("fsyncEvery", 100),
+            fsync_interval=config["journal"].get("fsyncInterval", 1.0),
+        )
+        if journal.resumed:
+            log.info(
+                f"Resuming from journal '{journal.filepath}' "
+                f"({len(journal)} downlinks already queued)"
+            )
+        elif args.resume:
+            log.warning(
+                "No journal of the input file to resume from, "
+                "starting from scratch."
+            )
+    elif args.resume:
+        log.warning("Can't resume, journal is disabled (journal: null).")
+
+    # per-gateway adaptive rate limiters (see rate_limiter)
+    limiters: Dict[str, AdaptiveRateLimiter] = {}
     # predefine counters
     n_gateways = 0
     n_devices = 0
     n_downlinks = 0
-    # * loop over all gateways (and devices (nested) and downlinks (nested)) *
-    for server in dct["server"]:
-        # try: # todo: is this level required? -> fix
-        # * create global client instance * +++++++++++++++++++++++++++++++
-        try:
-            client = Client(
-                base_url="https://{addr}:{port}/api".format(
-                    addr=server["address"]["host"],
-                    port=server["address"]["port"],
-                ),
-                headers={
-                    "accept": "application/json",
-                    "content-type": "application/json",
-                },
-                timeout=Timeout(
-                    **config["client"]["timeouts"]
-                    if config["client"]["timeouts"]
-                    else 5.0
-                ),
-                trust_env=config["client"]["enableEnvVars"],
-                verify=(not config["client"]["insecure"]),
-                default_encoding=config["client"]["encoding"],
-            )
-        except Exception as err:
-            log.critical(f"Failed client initialization: {err}")
-        else:
+    t_start = perf_counter()
+    if config["client"].get("async", False):
+        # * gateways and devices concurrently, downlinks of a device in order *
+        n_gateways, n_devices, n_downlinks = run_async(transmit_async(servers))
+    else:
+        # * loop over all gateways (and devices and downlinks (nested)) *
+        references = downlink_references()
+        for server in servers:
+            n_processed = n_devices  # devices processed before this gateway
+            # try: # todo: is this level required? -> fix
+            # * create global client instance * +++++++++++++++++++++++++++
+            try:
+                client = Client(**client_settings(server))
+            except Exception as err:
+                log.critical(
+                    f"Failed client initialization: {err}. "
+                    "Skipping server block ..."
+                )
+                continue  # continue with next server
             log.debug(f"Initialized client: {client}")
 
-        # * login and get session token for further authentication * ++++++
-        response: Response = login(
-            server["credentials"]["username"],
-            server["credentials"]["password"],
-        )
-        if response.status_code != 200:
-            log.critical(
-                f"Login to server '{server}' failed. Skipping server block ..."
-            )
-            continue  # continue with next server
+            # * login and get session token for further authentication * ++
+            if tokens.get(token_key(server)) is not None:
+                log.info(f"Reusing cached session token of {_trace(False)}")
+            else:
+                login(
+                    server["credentials"]["username"],
+                    server["credentials"]["password"],
+                )
+            if tokens.get(token_key(server)) is None:
+                log.critical(
+                    f"Login to server '{server}' failed. "
+                    "Skipping server block ..."
+                )
+                client.close()
+                continue  # continue with next server
 
-        downlinks = server["downlinks"]
-        # * loop over downlinks per device * ++++++++++++++++++++++++++++++
-        for dev_eui, downlinks in zip(downlinks, downlinks.values()):
-            try:
-                dev_eui = dev_eui.strip().upper()
-                # * save queue list before processing (optional) * --------
-                # todo: needs refactoring (cause config has been changed)
-                # if server["downlinkSettings"]["saveQueuePreProcess"]:
-                #     try:
-                #         filepath: str = (
-                #             f"{queueBackups}/{DT}--{dev_eui}--PRE.json"
-                #         )
-                #         with open(file=filepath, mode="w+") as json_file:
-                #             dct = get_downlink_queue(dev_eui).json()
-                #             json_save(obj=dct, fp=json_file)
-                #     except Exception as err:
-                #         log.warning(
-                #             "Failed to save queue (pre) backup of "
-                #             f"{_trace()}: {err}"
-                #         )
-                #     else:
-                #         log.info(
-                #             "Saved queue (pre) backup of "
-                #             f"{_trace()} to: {filepath}"
-                #         )
-                # * flush queue (optional) * ------------------------------
-                if server["downlinkSettings"]["flushQueue"]:
-                    try:
-                        flush_downlink_queue(dev_eui)
-                    except Exception as err:
-                        log.warning(
-                            "Failed to erase queue of " f"{_trace()}: {err}"
-                        )
-                    else:
+            downlinks = server["downlinks"]
+            # * loop over downlinks per device * ++++++++++++++++++++++++++++++
+            for n, (dev_eui, downlinks) in enumerate(
+                zip(downlinks, downlinks.values())
+            ):
+                sample_debug(n)
+                try:
+                    dev_eui = dev_eui.strip().upper()
+                    # * save queue list before processing (optional) * --------
+                    # todo: needs refactoring (cause config has been changed)
+                    # if server["downlinkSettings"]["saveQueuePreProcess"]:
+                    #     try:
+                    #         filepath: str = (
+                    #             f"{queueBackups}/{DT}--{dev_eui}--PRE.json"
+                    #         )
+                    #         with open(file=filepath, mode="w+") as json_file:
+                    #             dct = get_downlink_queue(dev_eui).json()
+                    #             json_save(obj=dct, fp=json_file)
+                    #     except Exception as err:
+                    #         log.warning(
+                    #             "Failed to save queue (pre) backup of "
+                    #             f"{_trace()}: {err}"
+                    #         )
+                    #     else:
+                    #         log.info(
+                    #             "Saved queue (pre) backup of "
+                    #             f"{_trace()} to: {filepath}"
+                    #         )
+                    # * resume from journal (optional) *
+                    start = resume_index(server, dev_eui, downlinks)
+                    if downlinks and start == len(downlinks):
+                        log.info(f"Skipping completed device {_trace()}.")
+                        n_devices += 1
+                        continue
+                    n_queued = 0
+                    # * flush queue (optional) * ------------------------------
+                    if server["downlinkSettings"]["flushQueue"] and not start:
+                        # don't queue on top of stale downlinks
+                        if flush_downlink_queue(dev_eui) is None:
+                            log.error(
+                                f"Failed to erase queue of {_trace()}, "
+                                "skipping device."
+                            )
+                            continue
                         log.info(
                             "Flushed (deleted) all queued downlinks of "
                             f"{_trace()}"
                         )
-                # * queue downlinks * -------------------------------------
-                for downlink in downlinks:
-                    try:
-                        response = queue_downlink(
-                            devEUI=dev_eui,
-                            data=downlink,  # .strip().lower() + base64 enc.
-                            fport=server["downlinkSettings"]["fport"],
-                            confirmed=server["downlinkSettings"]["confirmed"],
-                            reference=str(n_downlinks + 1),
-                        )
-                        if response.status_code == 200:
-                            n_downlinks += 1
-                            log.debug(
-                                f"Added downlink '{downlink}' to "
-                                f"{_trace()} queue."
+                    # * queue downlinks * -------------------------------------
+                    for index in range(start, len(downlinks)):
+                        downlink = downlinks[index]
+                        try:
+                            response = queue_downlink(
+                                devEUI=dev_eui,
+                                data=downlink,  # .strip().lower() + b64
+                                fport=server["downlinkSettings"]["fport"],
+                                confirmed=server["downlinkSettings"][
+                                    "confirmed"
+                                ],
+                                reference=next(references),
                             )
-                        else:
+                            if (
+                                response is not None
+                                and response.status_code == 200
+                            ):
+                                n_downlinks += 1
+                                n_queued += 1
+                                if journal is not None:
+                                    journal.queued(
+                                        _trace(False), dev_eui, index
+                                    )
+                                if debug_sampled():
+                                    log.debug(
+                                        "Added downlink '%s' to %s queue.",
+                                        downlink,
+                                        _trace(),
+                                    )
+                            else:
+                                log.error(
+                                    f"Failed to add downlink '{downlink}' to "
+                                    f"{_trace()} queue."
+                                )
+                        except Exception as err:
                             log.error(
-                                f"Failed to add downlink '{downlink}' to "
-                                f"{_trace()} queue."
+                                f"Downlink queue error of {_trace()}: {err}"
                             )
-                    except Exception as err:
-                        log.error(f"Downlink queue error of {_trace()}: {err}")
+                        else:
+                            if debug_sampled():
+                                log.debug(
+                                    "Queued downlink '%s' for %s",
+                                    downlink,
+                                    _trace(),
+                                )
                     else:
-                        log.debug(
-                            f"Queued downlink '{downlink}' for {_trace()}"
-                        )
+                        log.info(f"Queued downlinks for {_trace()}")
+                    if journal is not None and start + n_queued == len(
+                        downlinks
+                    ):
+                        journal.completed(_trace(False), dev_eui)
+                    # * save queue list after processing (optional)
+                    # todo: needs refactoring (cause config has been changed)
+                    # if server["downlinkSettings"]["saveQueuePostProcess"]:
+                    #     try:
+                    #         filepath = (
+                    #             f"{queueBackups}/{DT}--{dev_eui}--POST.json"
+                    #         )
+                    #         with open(file=filepath, mode="w+") as json_file:
+                    #             dct = get_downlink_queue(dev_eui).json()
+                    #             json_save(obj=dct, fp=json_file)
+                    #     except Exception as err:
+                    #         log.warning(
+                    #             "Failed to save queue (post) backup of "
+                    #             f"{_trace()}: {err}"
+                    #         )
+                    #     else:
+                    #         log.info(
+                    #             "Saved queue (post) backup of "
+                    #             f"{_trace()} to: {filepath}"
+                    #         )
+                except Exception as err:
+                    log.critical(
+                        "Unexpected error during device processing of "
+                        f"{_trace()} {err}"
+                    )
                 else:
-                    log.info(f"Queued downlinks for {_trace()}")
-                # * save queue list after processing (optional)
-                # todo: needs refactoring (cause config has been changed)
-                # if server["downlinkSettings"]["saveQueuePostProcess"]:
-                #     try:
-                #         filepath = (
-                #             f"{queueBackups}/{DT}--{dev_eui}--POST.json"
-                #         )
-                #         with open(file=filepath, mode="w+") as json_file:
-                #             dct = get_downlink_queue(dev_eui).json()
-                #             json_save(obj=dct, fp=json_file)
-                #     except Exception as err:
-                #         log.warning(
-                #             "Failed to save queue (post) backup of "
-                #             f"{_trace()}: {err}"
-                #         )
-                #     else:
-                #         log.info(
-                #             "Saved queue (post) backup of "
-                #             f"{_trace()} to: {filepath}"
-                #         )
-            except Exception as err:
-                log.critical(
-                    "Unexpected error during device processing of "
-                    f"{_trace()} {err}"
-                )
+                    n_devices += 1
+                    log.info(f"Successfully processed device {_trace()}.")
             else:
-                n_devices += 1
-                log.info(f"Successfully processed device {_trace()}.")
+                log.debug(f"Device loop over without interruptions.")
+            n_gateways += int(n_devices > n_processed)
+            log_rate_limit(server)
+            client.close()  # release pooled (keep-alive) connections
+        # todo: is this level required? -> fix
+        # except Exception as err:
+        #     log.critical(
+        #         "Unexpected error during gateway processing "
+        #         f"(trace: {_trace()})."
+        #     )
+        # else:
+        #     n_gateways += 1
+        #     log.info(
+        #         f"Successfully processed all downlinks for {_trace(False)}"
+        #     )
         else:
-            log.debug(f"Device loop over without interruptions.")
-    # todo: is this level required? -> fix
-    # except Exception as err:
-    #     log.critical(
-    #         "Unexpected error during gateway processing "
-    #         f"(trace: {_trace()})."
-    #     )
-    # else:
-    #     n_gateways += 1
-    #     log.info(
-    #         f"Successfully processed all downlinks for {_trace(False)}"
-    #     )
-    else:
-        log.debug(f"Gateway loop over without interruptions.")
+            log.debug(f"Gateway loop over without interruptions.")
+    metrics.observe("transmit", perf_counter() - t_start)
+
+    if journal is not None:
+        journal.close()
 
     # * gather statistics and log them ########################################
     try:
-        n_total_gateways = len(config["gateways"])
-        n_total_devices, n_total_downlinks = 0, 0
-        for server in config["server"]:
-            n_total_devices += len(config["gateways"]["downlinks"])
-            for dl in config["server"]["downlinks"].values():
-                n_total_downlinks += len(dl)
+        n_total_gateways = totals["gateways"]
+        n_total_devices = totals["devices"]
+        n_total_downlinks = totals["downlinks"]
     except Exception as err:
         log.debug(f"Failed gather statistics: {err}")
     else:
@@ -567,6 +1582,33 @@ if __name__ == "__main__":
             f"Successfully queued {n_downlinks}/{n_total_downlinks} downlinks."
         )
 
+    # * log and save timing metrics of the run *
+    summary = metrics.summary()
+    for name, timer in summary["timers"].items():
+        calls = summary["counters"].get(f"{name}_calls")
+        if calls is None:  # not a request method
+            log.debug(
+                f"Timer '{name}': {timer['count']} calls, total "
+                f"{timer['sum']:.3f} s, max. {timer['max'] * 1000:.1f} ms."
+            )
+            continue
+        log.info(
+            f"Requests '{name}': {calls} calls, "
+            f"{timer['count'] - calls} retries, "
+            f"{timer['failed']} failed attempts, avg. "
+            f"{timer['mean'] * 1000:.1f} ms, "
+            f"max. {timer['max'] * 1000:.1f} ms per attempt."
+        )
+    if config.get("metrics"):
+        try:
+            metrics.export(config["metrics"]["filepath"])
+        except Exception as err:
+            log.warning(f"Couldn't save timing metrics, cause: {err}")
+        else:
+            log.info(
+                f"Saved timing metrics as '{config['metrics']['filepath']}'."
+            )
+
     log.info("All done.")
 
     # print(get_downlink_queue(dev_eui).json())